@@ -0,0 +1,46 @@
+"""Stream a movie catalog file into MongoDB.
+
+Usage: python ingest_catalog.py catalog.ndjson
+       python ingest_catalog.py catalog.csv --format csv
+
+Uses the same validation and batched upserts as
+POST /api/admin/movies/ingest. The file is read in chunks, so memory stays
+flat regardless of its size.
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from server import client, ingest_movies, iter_csv_rows, iter_lines, iter_ndjson_rows
+
+CHUNK_SIZE = 1 << 16
+
+
+async def read_chunks(path: Path):
+    with path.open('rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=('ndjson', 'csv'))
+    args = parser.parse_args()
+
+    fmt = args.format or ('csv' if args.path.suffix.lower() == '.csv' else 'ndjson')
+    lines = iter_lines(read_chunks(args.path))
+    rows = iter_csv_rows(lines) if fmt == 'csv' else iter_ndjson_rows(lines)
+    try:
+        report = await ingest_movies(rows)
+    finally:
+        client.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,24 +1,298 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo import monitoring
+from prometheus_client import CONTENT_TYPE_LATEST, Counter as MetricCounter, Gauge, Histogram, generate_latest
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter, ValidationError
+from typing import AsyncIterator, List, Optional
 import uuid
+import re
+import math
+import bisect
+import heapq
+import base64
+import csv
+import json
+import time
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timezone, timedelta
 import bcrypt
 import jwt
+import orjson
+import numpy as np
+import scipy.sparse as sp
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# ==================== Metrics ====================
+
+METRICS_LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get('METRICS_LOOP_LAG_INTERVAL_SECONDS', '0.5'))
+
+HTTP_REQUESTS = MetricCounter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until response headers",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time",
+    ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+MONGO_COMMAND_FAILURES = MetricCounter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error",
+    ["collection", "command"]
+)
+BCRYPT_SECONDS = Histogram(
+    "bcrypt_duration_seconds", "Time spent hashing or verifying one password",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+)
+SERIALIZATION_SECONDS = Histogram(
+    "response_serialization_seconds", "Time spent validating and encoding JSON responses",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+)
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "How late the last loop-lag probe woke up")
+
+# Commands whose first field is not a collection name
+MONGO_ADMIN_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "buildInfo", "endSessions", "saslStart", "saslContinue"}
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every command the driver sends, labelled by collection and verb.
+
+    The collection name only appears on the started event, so it is kept by
+    request id until the matching succeeded/failed event arrives. Callbacks
+    run on Motor's worker threads; dict set/pop are atomic under the GIL.
+    """
+    
+    def __init__(self):
+        self._collections = {}
+    
+    def started(self, event):
+        if event.command_name in MONGO_ADMIN_COMMANDS:
+            return
+        name = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            name = event.command.get("collection")
+        self._collections[(event.connection_id, event.request_id)] = name if isinstance(name, str) else ""
+    
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), None)
+        if collection is not None:
+            MONGO_COMMAND_SECONDS.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+    
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), None)
+        if collection is not None:
+            MONGO_COMMAND_SECONDS.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+            MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+async def sample_event_loop_lag() -> None:
+    # A sleep that wakes up late means something held the loop
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(METRICS_LOOP_LAG_INTERVAL_SECONDS)
+        EVENT_LOOP_LAG.set(max(time.perf_counter() - start - METRICS_LOOP_LAG_INTERVAL_SECONDS, 0.0))
+
+loop_lag_task = None
+
+# ==================== Slow Query Log ====================
+
+SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE', '200'))
+SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() in ('1', 'true', 'yes')
+
+# Command fields that describe which documents are touched and in what order
+QUERY_SHAPE_FIELDS = ("filter", "query", "q", "sort", "pipeline", "updates", "deletes")
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+# Session and transport fields the driver adds that explain rejects or ignores
+NON_EXPLAINABLE_FIELDS = {"lsid", "txnNumber", "readConcern", "writeConcern", "startTransaction", "autocommit"}
+
+def query_shape(value, key: Optional[str] = None):
+    """Replace every literal in a command with "?" while keeping its structure.
+
+    Sort specs are kept verbatim since the direction is part of the shape.
+    Lists whose elements share a shape collapse to one element, so `$in`
+    lists and bulk write batches don't produce a new shape per size.
+    """
+    if key in ("sort", "$sort"):
+        return value
+    if isinstance(value, dict):
+        return {k: query_shape(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [query_shape(v) for v in value]
+        if key not in ("pipeline", "$and", "$or", "$nor") and shapes and all(s == shapes[0] for s in shapes):
+            return shapes[:1]
+        return shapes
+    return "?"
+
+def plan_stages(plan) -> List[dict]:
+    # Explain output nests stages differently per command and server version
+    stages = []
+    if isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.append(plan)
+        for key, value in plan.items():
+            if key not in ("rejectedPlans", "executionStats"):
+                stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+def summarize_plan(explain: dict) -> dict:
+    stages = plan_stages(explain)
+    names = [stage["stage"] for stage in stages]
+    return {
+        "stages": list(dict.fromkeys(names)),
+        "indexes": sorted({stage["indexName"] for stage in stages if "indexName" in stage}),
+        "collscan": "COLLSCAN" in names,
+        "in_memory_sort": "SORT" in names,
+    }
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Records MongoDB commands slower than a threshold, grouped by query shape.
+
+    Only shapes are kept, never the values in a filter. The first time a
+    shape is seen, the command is explained on the event loop in the
+    background and flagged if the winning plan scans the whole collection or
+    sorts in memory. Driver callbacks run on Motor's worker threads, so
+    shared state is guarded by a lock.
+    """
+    
+    def __init__(self, threshold_ms: float, size: int, explain: bool):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.recent = deque(maxlen=size)
+        self.shapes = OrderedDict()
+        self._max_shapes = size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._explains = set()
+    
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+    
+    def started(self, event):
+        if event.command_name in EXPLAINABLE_COMMANDS or event.command_name == "getMore":
+            self._pending[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        self._finish(event)
+    
+    def _finish(self, event) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        database_name, command = pending
+        name = event.command_name
+        collection = command.get("collection") if name == "getMore" else command.get(name)
+        shape = {field: query_shape(command[field], field) for field in QUERY_SHAPE_FIELDS if field in command}
+        key = (collection, name, json.dumps(shape, sort_keys=True, default=str))
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self.recent.append({
+                "collection": collection,
+                "command": name,
+                "shape": shape,
+                "duration_ms": round(duration_ms, 3),
+                "at": now,
+            })
+            entry = self.shapes.get(key)
+            is_new = entry is None
+            if is_new:
+                entry = self.shapes[key] = {
+                    "collection": collection,
+                    "command": name,
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "plan": None,
+                }
+                if len(self.shapes) > self._max_shapes:
+                    self.shapes.popitem(last=False)
+            else:
+                self.shapes.move_to_end(key)
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_seen"] = now
+        if is_new and self.explain and name in EXPLAINABLE_COMMANDS and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._schedule_explain, entry, database_name, command)
+    
+    def _schedule_explain(self, entry: dict, database_name: str, command: dict) -> None:
+        task = asyncio.create_task(self._explain(entry, database_name, command))
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+    
+    async def _explain(self, entry: dict, database_name: str, command: dict) -> None:
+        target = {
+            k: v for k, v in command.items()
+            if not k.startswith("$") and k not in NON_EXPLAINABLE_FIELDS
+        }
+        # explain only accepts a single write statement
+        for field in ("updates", "deletes"):
+            if field in target:
+                target[field] = target[field][:1]
+        try:
+            result = await client[database_name].command({"explain": target, "verbosity": "queryPlanner"})
+        except Exception as exc:
+            entry["plan"] = {"error": str(exc)}
+            return
+        plan = summarize_plan(result)
+        entry["plan"] = plan
+        if plan["collscan"] or plan["in_memory_sort"]:
+            logger.warning(
+                "Slow %s on %s uses %s: %s", entry["command"], entry["collection"],
+                "/".join(s for s in ("COLLSCAN", "SORT") if s in plan["stages"]),
+                json.dumps(entry["shape"], default=str)
+            )
+    
+    def stop(self) -> None:
+        for task in list(self._explains):
+            task.cancel()
+    
+    def worst(self, limit: int, order_by: str = "total_ms") -> List[dict]:
+        with self._lock:
+            entries = [dict(entry) for entry in self.shapes.values()]
+        return heapq.nlargest(limit, entries, key=lambda entry: entry[order_by])
+    
+    def recent_entries(self, limit: int) -> List[dict]:
+        with self._lock:
+            return list(self.recent)[-limit:][::-1]
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+event_listeners = [MongoCommandMetrics()]
+if SLOW_QUERY_LOG_ENABLED:
+    event_listeners.append(slow_query_log)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True, event_listeners=event_listeners)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
@@ -26,10 +300,71 @@ SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-product
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Authenticated-user cache configuration
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '10000'))
+AUTH_CACHE_TTL_SECONDS = float(os.environ.get('AUTH_CACHE_TTL_SECONDS', '60'))
+# Sign name/email/created_at into tokens so requests skip the users lookup
+AUTH_EMBED_CLAIMS = os.environ.get('AUTH_EMBED_CLAIMS', 'false').lower() in ('1', 'true', 'yes')
+
+# Watch-history write-behind configuration
+WATCH_HISTORY_WRITE_BEHIND = os.environ.get('WATCH_HISTORY_WRITE_BEHIND', 'false').lower() in ('1', 'true', 'yes')
+WATCH_HISTORY_FLUSH_SECONDS = float(os.environ.get('WATCH_HISTORY_FLUSH_SECONDS', '5'))
+WATCH_HISTORY_FLUSH_SIZE = int(os.environ.get('WATCH_HISTORY_FLUSH_SIZE', '1000'))
+
+# Password hashing configuration
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_QUEUE = int(os.environ.get('BCRYPT_MAX_QUEUE', '64'))
+
+# Catalog cache configuration
+CATALOG_CACHE_SIZE = int(os.environ.get('CATALOG_CACHE_SIZE', '1024'))
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '300'))
+
+# Return trusted DB reads from list endpoints without Pydantic re-validation
+FAST_JSON_RESPONSES = os.environ.get('FAST_JSON_RESPONSES', 'true').lower() in ('1', 'true', 'yes')
+
+# Background conversion of ISO string timestamps to BSON dates
+MIGRATE_TIMESTAMPS_ON_STARTUP = os.environ.get('MIGRATE_TIMESTAMPS_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+TIMESTAMP_MIGRATION_BATCH_SIZE = int(os.environ.get('TIMESTAMP_MIGRATION_BATCH_SIZE', '500'))
+TIMESTAMP_MIGRATION_PAUSE_SECONDS = float(os.environ.get('TIMESTAMP_MIGRATION_PAUSE_SECONDS', '0.05'))
+
+# Cache-Control sent with catalog responses, per route
+CACHE_CONTROL = {
+    "movies": os.environ.get('CACHE_CONTROL_MOVIES', 'public, max-age=30, stale-while-revalidate=300'),
+    "movie": os.environ.get('CACHE_CONTROL_MOVIE', 'public, max-age=60, stale-while-revalidate=600'),
+    "genres": os.environ.get('CACHE_CONTROL_GENRES', 'public, max-age=300, stale-while-revalidate=3600'),
+    "reviews": os.environ.get('CACHE_CONTROL_REVIEWS', 'public, max-age=10, stale-while-revalidate=60'),
+}
+
+# Rows per bulk_write when ingesting catalog files
+INGEST_BATCH_SIZE = int(os.environ.get('INGEST_BATCH_SIZE', '1000'))
+
+# Documents per chunk written to export streams
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+# Item-to-item recommendations
+RECOMMENDATIONS_ENABLED = os.environ.get('RECOMMENDATIONS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RECOMMENDATIONS_REFRESH_SECONDS = float(os.environ.get('RECOMMENDATIONS_REFRESH_SECONDS', '900'))
+RECOMMENDATIONS_NEIGHBORS = int(os.environ.get('RECOMMENDATIONS_NEIGHBORS', '50'))
+
+# Content-based "more like this"
+CONTENT_GENRE_WEIGHT = float(os.environ.get('CONTENT_GENRE_WEIGHT', '0.3'))
+CONTENT_REBUILD_RATIO = float(os.environ.get('CONTENT_REBUILD_RATIO', '0.2'))
+
+# Trending / top-rated leaderboards
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_LOOKBACK_DAYS = float(os.environ.get('TRENDING_LOOKBACK_DAYS', '14'))
+LEADERBOARD_SIZE = int(os.environ.get('LEADERBOARD_SIZE', '100'))
+LEADERBOARD_RESEED_SECONDS = float(os.environ.get('LEADERBOARD_RESEED_SECONDS', '600'))
+BAYESIAN_PRIOR_COUNT = float(os.environ.get('BAYESIAN_PRIOR_COUNT', '10'))
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
 security = HTTPBearer()
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ==================== Models ====================
@@ -94,6 +429,50 @@ class Review(BaseModel):
     comment: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class MovieSummary(BaseModel):
+    """The subset of Movie rendered by MovieCard."""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    genre: List[str]
+    year: int
+    duration: int
+    poster_url: str
+    rating_avg: float = 0.0
+    rating_count: int = 0
+
+class FavoriteMovie(MovieSummary):
+    favorited_at: datetime
+
+class WatchedMovie(MovieSummary):
+    watched_at: datetime
+    progress: int = 0
+
+MOVIE_CARD_PROJECTION = tuple(MovieSummary.model_fields)
+
+# Projections matching the response models exactly, so documents read with
+# them can be serialized as-is
+MOVIE_PROJECTION = {"_id": 0, **{field: 1 for field in Movie.model_fields}}
+REVIEW_PROJECTION = {"_id": 0, **{field: 1 for field in Review.model_fields}}
+
+MOVIE_ADAPTER = TypeAdapter(Movie)
+MOVIE_LIST_ADAPTER = TypeAdapter(List[Movie])
+REVIEW_LIST_ADAPTER = TypeAdapter(List[Review])
+FAVORITE_MOVIE_LIST_ADAPTER = TypeAdapter(List[FavoriteMovie])
+WATCHED_MOVIE_LIST_ADAPTER = TypeAdapter(List[WatchedMovie])
+
+MOVIE_BATCH_MAX_IDS = 100
+
+class MovieBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MOVIE_BATCH_MAX_IDS)
+
+class MovieBatchResponse(BaseModel):
+    # Same order as the requested ids, null where no movie exists
+    movies: List[Optional[Movie]]
+    not_found: List[str]
+
+MOVIE_BATCH_ADAPTER = TypeAdapter(MovieBatchResponse)
+
 class ReviewCreate(BaseModel):
     rating: int
     comment: str
@@ -108,11 +487,87 @@ class WatchHistoryCreate(BaseModel):
 # ==================== Helper Functions ====================
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+class HashingPool:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. At most
+    workers + max_queue calls may be outstanding; beyond that callers get a
+    503 immediately instead of piling up behind a login burst.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+        self._busy_lock = threading.Lock()
+    
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Runs on the worker threads, and += is not atomic
+            with self._busy_lock:
+                self.busy_seconds += elapsed
+            BCRYPT_SECONDS.observe(elapsed)
+    
+    async def run(self, fn, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+    
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "rounds": BCRYPT_ROUNDS,
+            "active": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "utilization": self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0,
+        }
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+hashing_pool = HashingPool(BCRYPT_WORKERS, BCRYPT_MAX_QUEUE)
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await hashing_pool.run(verify_password, password, hashed)
+
+def token_claims(user: User) -> dict:
+    claims = {"sub": user.id}
+    if AUTH_EMBED_CLAIMS:
+        claims.update({
+            "name": user.name,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        })
+    return claims
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -122,21 +577,1705 @@ def create_access_token(data: dict) -> str:
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            expires_in = payload["exp"] - time.time() if "exp" in payload else None
+            token_cache.set(token, payload, ttl=expires_in)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+        # Tokens issued with AUTH_EMBED_CLAIMS carry the profile themselves
+        if "name" in payload and "email" in payload:
+            return {
+                "id": user_id,
+                "name": payload["name"],
+                "email": payload["email"],
+                "created_at": payload.get("created_at"),
+            }
+        
+        user = user_cache.get(user_id)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
+            user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(user_id, user)
         
-        return user
+        # Handlers may modify the dict, keep the cached copy intact
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def rating_increment_pipeline(rating: int) -> list:
+    """Update pipeline adding one rating to a movie's running aggregates.
+
+    Equivalent to $inc on rating_sum, rating_count and the histogram bucket,
+    but as a pipeline so rating_avg is derived from the incremented values in
+    the same atomic write.
+    """
+    def current(field: str) -> dict:
+        return {"$ifNull": [f"${field}", 0]}
+    
+    return [
+        {"$set": {
+            "rating_sum": {"$add": [current("rating_sum"), rating]},
+            "rating_count": {"$add": [current("rating_count"), 1]},
+            f"rating_histogram.{rating}": {"$add": [current(f"rating_histogram.{rating}"), 1]},
+        }},
+        {"$set": {
+            "rating_avg": {"$round": [{"$divide": ["$rating_sum", "$rating_count"]}, 1]},
+        }},
+    ]
+
+RATING_AGGREGATE_PIPELINE = [
+    {"$group": {
+        "_id": {"movie_id": "$movie_id", "rating": "$rating"},
+        "count": {"$sum": 1},
+    }},
+    {"$group": {
+        "_id": "$_id.movie_id",
+        "rating_sum": {"$sum": {"$multiply": ["$_id.rating", "$count"]}},
+        "rating_count": {"$sum": "$count"},
+        "buckets": {"$push": {"k": {"$toString": "$_id.rating"}, "v": "$count"}},
+    }},
+    {"$project": {
+        "_id": 0,
+        "id": "$_id",
+        "rating_sum": 1,
+        "rating_count": 1,
+        "rating_histogram": {"$arrayToObject": "$buckets"},
+        "rating_avg": {"$round": [{"$divide": ["$rating_sum", "$rating_count"]}, 1]},
+    }},
+]
+
+async def rebuild_rating_aggregates(dry_run: bool = False) -> dict:
+    """Recompute every movie's rating aggregates from the reviews collection.
+
+    With dry_run the stored aggregates are only compared against the
+    recomputed ones and drifted movie ids are reported. Movies without any
+    review are left untouched so their seeded rating_avg is kept.
+    """
+    if not dry_run:
+        await db.reviews.aggregate(RATING_AGGREGATE_PIPELINE + [
+            {"$merge": {
+                "into": "movies",
+                "on": "id",
+                "whenMatched": "merge",
+                "whenNotMatched": "discard",
+            }},
+        ]).to_list(None)
+        return {"rebuilt": True}
+    
+    checked = 0
+    drifted = []
+    async for expected in db.reviews.aggregate(RATING_AGGREGATE_PIPELINE):
+        checked += 1
+        stored = await db.movies.find_one(
+            {"id": expected["id"]},
+            {"_id": 0, "rating_sum": 1, "rating_count": 1, "rating_histogram": 1}
+        )
+        if stored is None:
+            continue
+        if (
+            stored.get("rating_sum") != expected["rating_sum"]
+            or stored.get("rating_count") != expected["rating_count"]
+            or stored.get("rating_histogram", {}) != expected["rating_histogram"]
+        ):
+            drifted.append(expected["id"])
+    return {"checked": checked, "drifted": drifted}
+
+# ==================== Catalog Cache ====================
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL.
+
+    Only touched from the event loop, so no locking is needed.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key) -> None:
+        self._data.pop(key, None)
+    
+    def invalidate_where(self, predicate) -> None:
+        """Drop every entry for which predicate(key, value) is true."""
+        stale = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in stale:
+            del self._data[key]
+    
+    def clear(self) -> None:
+        self._data.clear()
+    
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+# Single movies by id, and list/search/genre results by normalized query
+movie_cache = TTLCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
+catalog_query_cache = TTLCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
+
+# Decoded tokens (token -> claims) and user profiles (user id -> user).
+# Token entries never outlive the token's own exp.
+token_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id: str) -> None:
+    """Drop a cached profile after the user document changes."""
+    user_cache.invalidate(user_id)
+
+def invalidate_catalog(movie_id: Optional[str] = None) -> None:
+    """Drop cached catalog reads after a write to the movies collection.
+
+    With a movie_id, only that movie's fields changed (not which lists it
+    belongs to or their order), so just its own entries and the list pages
+    that contain it are dropped.
+    """
+    if movie_id is None:
+        movie_cache.clear()
+        catalog_query_cache.clear()
+        return
+    movie_cache.invalidate(movie_id)
+    
+    def affected(key, cached) -> bool:
+        if key[0] in ("movie", "reviews"):
+            return key[1] == movie_id
+        return key[0] == "movies" and movie_id in cached.movie_ids
+    
+    catalog_query_cache.invalidate_where(affected)
+
+def invalidate_catalog_query(key) -> None:
+    catalog_query_cache.invalidate(key)
+
+def normalize_search(search: Optional[str]) -> Optional[str]:
+    if not search:
+        return None
+    return ' '.join(search.lower().split()) or None
+
+# ==================== Genre Catalog ====================
+
+async def adjust_genre_counts(added: List[str] = (), removed: List[str] = ()) -> None:
+    """Apply genre membership changes from movie writes to the genres table.
+
+    Pass every inserted movie's genres as added (and for updates, the old
+    genres as removed) so /genres never has to scan the movies collection.
+    """
+    delta = Counter(added)
+    delta.subtract(Counter(removed))
+    ops = [
+        UpdateOne({"name": name}, {"$inc": {"movie_count": count}}, upsert=True)
+        for name, count in delta.items()
+        if count
+    ]
+    if ops:
+        await db.genres.bulk_write(ops, ordered=False)
+    invalidate_catalog_query(("genres",))
+
+async def rebuild_genre_catalog() -> None:
+    """Recompute the genres table from the movies collection."""
+    counts = await db.movies.aggregate([
+        {"$unwind": "$genre"},
+        {"$group": {"_id": "$genre", "movie_count": {"$sum": 1}}},
+    ]).to_list(None)
+    # Genres are few; zero out any that no movie carries anymore
+    ops = [
+        UpdateOne({"name": g["_id"]}, {"$set": {"movie_count": g["movie_count"]}}, upsert=True)
+        for g in counts
+    ]
+    ops.append(UpdateMany(
+        {"name": {"$nin": [g["_id"] for g in counts]}},
+        {"$set": {"movie_count": 0}}
+    ))
+    await db.genres.bulk_write(ops, ordered=False)
+    invalidate_catalog_query(("genres",))
+
+# ==================== Movie ID Index ====================
+
+class MovieIdIndex:
+    """In-memory set of known movie ids for write-path validation.
+
+    Loaded at startup and updated by catalog writes, so checking that a movie
+    exists is a set lookup. A miss is confirmed against MongoDB (movies may be
+    added by another worker) and remembered when found.
+    """
+    
+    def __init__(self):
+        self._ids = set()
+        self.confirmations = 0
+    
+    async def load(self) -> None:
+        ids = set()
+        async for movie in db.movies.find({}, {"_id": 0, "id": 1}):
+            ids.add(movie['id'])
+        self._ids = ids
+    
+    def add(self, movie_ids) -> None:
+        self._ids.update(movie_ids)
+    
+    async def exists(self, movie_id: str) -> bool:
+        if movie_id in self._ids:
+            return True
+        self.confirmations += 1
+        if await db.movies.find_one({"id": movie_id}, {"_id": 1}) is None:
+            return False
+        self._ids.add(movie_id)
+        return True
+    
+    def stats(self) -> dict:
+        return {"size": len(self._ids), "confirmations": self.confirmations}
+
+movie_id_index = MovieIdIndex()
+
+async def ensure_movie_exists(movie_id: str) -> None:
+    if not await movie_id_index.exists(movie_id):
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+async def resolve_movies(ids: List[str]) -> dict:
+    """Look up movies by id through the movie cache, fetching misses with one $in."""
+    found = {}
+    missing = []
+    for movie_id in dict.fromkeys(ids):
+        movie = movie_cache.get(movie_id)
+        if movie is None:
+            missing.append(movie_id)
+        else:
+            found[movie_id] = movie
+    
+    if missing:
+        async for movie in db.movies.find({"id": {"$in": missing}}, MOVIE_PROJECTION):
+            movie_cache.set(movie['id'], movie)
+            found[movie['id']] = movie
+    return found
+
+# ==================== Recommendations ====================
+
+# Interaction weights for the user x movie matrix
+FAVORITE_WEIGHT = 3.0
+WATCH_WEIGHT = 1.0
+
+def watch_weight(progress) -> float:
+    # Finishing a movie counts double compared to opening it
+    return WATCH_WEIGHT + min(max(progress or 0, 0), 100) / 100
+
+def compute_item_neighbors(rows, cols, weights, n_users: int, n_items: int, k: int) -> tuple:
+    """Top-k cosine neighbours of every item in a sparse user x item matrix.
+
+    Returns the interaction matrix (CSR) and two n_items x k arrays of
+    neighbour indices (-1 padded) and float32 similarities, best first.
+    Similarities are computed a block of items at a time, so memory is
+    bounded by the block's sparse product, not n_items squared.
+    """
+    interactions = sp.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), (np.asarray(rows), np.asarray(cols))),
+        shape=(n_users, n_items)
+    )
+    interactions.sum_duplicates()
+    
+    norms = np.sqrt(np.asarray(interactions.multiply(interactions).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    normalized = (interactions @ sp.diags(1.0 / norms)).tocsc()
+    normalized_t = normalized.T.tocsr()
+    
+    neighbors = np.full((n_items, k), -1, dtype=np.int32)
+    scores = np.zeros((n_items, k), dtype=np.float32)
+    block = 1024
+    for start in range(0, n_items, block):
+        similarities = (normalized_t[start:start + block] @ normalized).tocsr()
+        for offset in range(similarities.shape[0]):
+            item = start + offset
+            begin, end = similarities.indptr[offset], similarities.indptr[offset + 1]
+            candidates = similarities.indices[begin:end]
+            values = similarities.data[begin:end]
+            keep = candidates != item
+            candidates, values = candidates[keep], values[keep]
+            if len(candidates) > k:
+                top = np.argpartition(values, -k)[-k:]
+                candidates, values = candidates[top], values[top]
+            order = np.argsort(-values)
+            neighbors[item, :len(order)] = candidates[order]
+            scores[item, :len(order)] = values[order]
+    return interactions, neighbors, scores
+
+class RecommendationIndex:
+    """Item-item collaborative filtering served from memory.
+
+    A periodic job rebuilds the neighbour arrays from favorites and watch
+    history; lookups are array indexing. Interactions recorded since the last
+    build are kept per user so recommendations reflect them immediately.
+    """
+    
+    def __init__(self):
+        self.item_ids = np.array([], dtype=object)
+        self.item_index = {}
+        self.user_index = {}
+        self.interactions = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.neighbors = np.zeros((0, 0), dtype=np.int32)
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+        self.recent = {}
+        self.built_at = None
+        self.build_seconds = None
+        self._task = None
+    
+    async def build(self) -> None:
+        started = time.perf_counter()
+        user_index = {}
+        item_index = {}
+        rows, cols, weights = [], [], []
+        
+        def add(user_id: str, movie_id: str, weight: float) -> None:
+            rows.append(user_index.setdefault(user_id, len(user_index)))
+            cols.append(item_index.setdefault(movie_id, len(item_index)))
+            weights.append(weight)
+        
+        async for fav in db.favorites.find({}, {"_id": 0, "user_id": 1, "movie_id": 1}):
+            add(fav['user_id'], fav['movie_id'], FAVORITE_WEIGHT)
+        async for row in db.watch_history.find({}, {"_id": 0, "user_id": 1, "movie_id": 1, "progress": 1}):
+            add(row['user_id'], row['movie_id'], watch_weight(row.get('progress')))
+        
+        # Numeric work runs off the event loop
+        interactions, neighbors, scores = await asyncio.to_thread(
+            compute_item_neighbors, rows, cols, weights,
+            len(user_index), len(item_index), RECOMMENDATIONS_NEIGHBORS
+        )
+        
+        item_ids = np.empty(len(item_index), dtype=object)
+        for movie_id, index in item_index.items():
+            item_ids[index] = movie_id
+        
+        # Swap everything at once so readers never see a half-built index
+        self.item_ids, self.item_index, self.user_index = item_ids, item_index, user_index
+        self.interactions, self.neighbors, self.scores = interactions, neighbors, scores
+        self.recent = {}
+        self.built_at = datetime.now(timezone.utc)
+        self.build_seconds = time.perf_counter() - started
+    
+    def record(self, user_id: str, movie_id: str, kind: str, weight: float) -> None:
+        """Fold a new interaction into the user's profile until the next build.
+
+        Like build(), a movie counts one favorite plus its latest watch
+        weight, so repeated progress updates replace rather than accumulate.
+        """
+        profile = self.recent.setdefault(user_id, {})
+        profile.setdefault(movie_id, {})[kind] = weight
+    
+    def similar(self, movie_id: str, limit: int) -> List[str]:
+        index = self.item_index.get(movie_id)
+        if index is None:
+            return []
+        neighbors = self.neighbors[index, :limit]
+        return list(self.item_ids[neighbors[neighbors >= 0]])
+    
+    def recommend(self, user_id: str, limit: int) -> List[str]:
+        profile = {}
+        user = self.user_index.get(user_id)
+        if user is not None:
+            row = self.interactions[user]
+            profile.update(zip(row.indices.tolist(), row.data.tolist()))
+        for movie_id, kinds in self.recent.get(user_id, {}).items():
+            index = self.item_index.get(movie_id)
+            if index is not None:
+                # The built row may already count the same interactions
+                profile[index] = max(profile.get(index, 0.0), sum(kinds.values()))
+        if not profile:
+            return []
+        
+        seen = np.fromiter(profile.keys(), dtype=np.int32)
+        seen_weights = np.fromiter(profile.values(), dtype=np.float32)
+        candidates = self.neighbors[seen].ravel()
+        contributions = (self.scores[seen] * seen_weights[:, None]).ravel()
+        keep = (candidates >= 0) & ~np.isin(candidates, seen)
+        if not keep.any():
+            return []
+        
+        unique, inverse = np.unique(candidates[keep], return_inverse=True)
+        totals = np.bincount(inverse, weights=contributions[keep])
+        top = np.argsort(-totals)[:limit]
+        return list(self.item_ids[unique[top]])
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.build()
+            except Exception:
+                logger.exception("Recommendation build failed")
+            await asyncio.sleep(RECOMMENDATIONS_REFRESH_SECONDS)
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    def stats(self) -> dict:
+        return {
+            "items": len(self.item_index),
+            "users": len(self.user_index),
+            "interactions": self.interactions.nnz,
+            "pending_users": len(self.recent),
+            "built_at": self.built_at,
+            "build_seconds": self.build_seconds,
+        }
+
+recommendations = RecommendationIndex()
+
+# ==================== Content Similarity ====================
+
+TOKEN_PATTERN = re.compile(r"\w\w+", re.UNICODE)
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in into is it its "
+    "of on or she that the their them they this to was were who will with".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+class ContentIndex:
+    """TF-IDF over title/description plus one-hot genres, one L2-normalized row per movie.
+
+    Text and genre parts are normalized separately and weighted so a row's
+    dot product with another is (1 - w) * text cosine + w * genre cosine,
+    with w = CONTENT_GENRE_WEIGHT. Similar movies are one sparse
+    matrix-vector product and an argpartition.
+
+    Inserted movies are queued and appended on a worker thread using the
+    current IDF. Once they exceed CONTENT_REBUILD_RATIO of the catalog, the
+    next query starts a background rebuild so IDF stays representative. Movies
+    added while a rebuild is running are queued again on top of its result,
+    or, past the same ratio, dropped in favour of one more rebuild.
+    """
+    
+    def __init__(self):
+        self.terms = {}
+        self.genres = {}
+        self.document_frequency = np.zeros(0, dtype=np.float32)
+        self.documents = 0
+        self.item_ids = []
+        self.item_index = {}
+        self.matrix = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.generation = 0
+        self._pending = []
+        self._rebuild_backlog = None
+        self._backlog_overflowed = False
+        self.appended_since_build = 0
+        self.needs_rebuild = False
+    
+    @staticmethod
+    def _features(movie: dict) -> tuple:
+        tokens = tokenize(f"{movie.get('title', '')} {movie.get('description', '')}")
+        return tokens, list(dict.fromkeys(movie.get('genre') or []))
+    
+    @staticmethod
+    def _row(tokens: List[str], genres: List[str], idf: np.ndarray, terms: dict, genre_columns: dict) -> tuple:
+        counts = Counter(t for t in tokens if t in terms)
+        cols = np.fromiter((terms[t] for t in counts), dtype=np.int64, count=len(counts))
+        tf = np.fromiter((1.0 + math.log(c) for c in counts.values()), dtype=np.float32, count=len(counts))
+        values = tf * idf[cols] if len(cols) else tf
+        norm = float(np.linalg.norm(values))
+        if norm:
+            values = values * (math.sqrt(1.0 - CONTENT_GENRE_WEIGHT) / norm)
+        
+        genre_cols = [len(terms) + genre_columns[g] for g in genres if g in genre_columns]
+        if genre_cols:
+            genre_value = math.sqrt(CONTENT_GENRE_WEIGHT / len(genre_cols))
+            cols = np.concatenate([cols, np.asarray(genre_cols, dtype=np.int64)])
+            values = np.concatenate([values, np.full(len(genre_cols), genre_value, dtype=np.float32)])
+        return cols, values
+    
+    @staticmethod
+    def _idf(documents: int, document_frequency: np.ndarray) -> np.ndarray:
+        return (np.log((1.0 + documents) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+    
+    def compute(self, movies: List[dict]) -> dict:
+        """Vocabulary, IDF and matrix built from scratch (CPU bound, touches no state)."""
+        features = [self._features(m) for m in movies]
+        terms = {}
+        genres = {}
+        frequency = Counter()
+        for tokens, movie_genres in features:
+            frequency.update(set(tokens))
+            for g in movie_genres:
+                genres.setdefault(g, len(genres))
+        for t in frequency:
+            terms[t] = len(terms)
+        
+        document_frequency = np.fromiter(frequency.values(), dtype=np.float32, count=len(frequency))
+        idf = self._idf(len(movies), document_frequency)
+        
+        indptr = [0]
+        indices = []
+        data = []
+        for tokens, movie_genres in features:
+            cols, values = self._row(tokens, movie_genres, idf, terms, genres)
+            indices.append(cols)
+            data.append(values)
+            indptr.append(indptr[-1] + len(cols))
+        matrix = sp.csr_matrix(
+            (
+                np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+                np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64),
+                np.asarray(indptr),
+            ),
+            shape=(len(movies), len(terms) + len(genres)),
+            dtype=np.float32
+        )
+        item_ids = [m['id'] for m in movies]
+        return {
+            "terms": terms,
+            "genres": genres,
+            "document_frequency": document_frequency,
+            "documents": len(movies),
+            "item_ids": item_ids,
+            "item_index": {movie_id: i for i, movie_id in enumerate(item_ids)},
+            "matrix": matrix,
+        }
+    
+    def begin_rebuild(self) -> None:
+        """Start collecting adds that a rebuild's MongoDB snapshot may miss."""
+        self._rebuild_backlog = []
+        self._backlog_overflowed = False
+    
+    def abort_rebuild(self) -> None:
+        self._rebuild_backlog = None
+        self._backlog_overflowed = False
+    
+    def install(self, state: dict) -> None:
+        """Swap in a computed index; adds made since begin_rebuild are merged next."""
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.generation += 1
+        self._pending = self._rebuild_backlog or []
+        self._rebuild_backlog = None
+        self.appended_since_build = 0
+        self.needs_rebuild = self._backlog_overflowed
+        self._backlog_overflowed = False
+        self._count_appended(len(self._pending))
+    
+    def build(self, movies: List[dict]) -> None:
+        """Rebuild vocabulary, IDF and matrix from scratch (CPU bound)."""
+        self.install(self.compute(movies))
+    
+    def _rebuild_threshold(self) -> float:
+        return CONTENT_REBUILD_RATIO * max(self.documents, 1)
+    
+    def _count_appended(self, count: int) -> None:
+        self.appended_since_build += count
+        if self.needs_rebuild or self.appended_since_build > self._rebuild_threshold():
+            self.needs_rebuild = True
+            self._pending = []
+    
+    def add(self, movies: List[dict]) -> None:
+        """Queue inserted or updated movies; merge_pending() folds them in."""
+        entries = [
+            {"id": m['id'], "title": m.get('title'), "description": m.get('description'), "genre": m.get('genre')}
+            for m in movies
+        ]
+        if self._rebuild_backlog is not None and not self._backlog_overflowed:
+            self._rebuild_backlog.extend(entries)
+            if len(self._rebuild_backlog) > self._rebuild_threshold():
+                # Too many to merge anyway: drop them and rebuild once more
+                self._rebuild_backlog = []
+                self._backlog_overflowed = True
+        if self.needs_rebuild:
+            # The rebuild reloads everything from MongoDB
+            return
+        self._pending.extend(entries)
+        self._count_appended(len(entries))
+    
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+    
+    def _merged(self, state: dict, pending: List[dict]) -> dict:
+        # Works on copies so queries keep reading the current index meanwhile
+        genres = dict(state["genres"])
+        item_ids = list(state["item_ids"])
+        item_index = dict(state["item_index"])
+        matrix = state["matrix"].copy()
+        idf = self._idf(state["documents"], state["document_frequency"])
+        rows = []
+        for movie in pending:
+            tokens, movie_genres = self._features(movie)
+            for g in movie_genres:
+                # Unseen genres get a column; unseen words wait for a rebuild
+                genres.setdefault(g, len(genres))
+            existing = item_index.get(movie['id'])
+            if existing is not None:
+                # Updated movie: blank its old row
+                start, end = matrix.indptr[existing], matrix.indptr[existing + 1]
+                matrix.data[start:end] = 0
+            item_index[movie['id']] = len(item_ids)
+            item_ids.append(movie['id'])
+            rows.append(self._row(tokens, movie_genres, idf, state["terms"], genres))
+        
+        width = len(state["terms"]) + len(genres)
+        appended = sp.csr_matrix(
+            (
+                np.concatenate([values for _, values in rows]),
+                np.concatenate([cols for cols, _ in rows]),
+                np.concatenate([[0], np.cumsum([len(cols) for cols, _ in rows])]),
+            ),
+            shape=(len(rows), width),
+            dtype=np.float32
+        )
+        matrix.resize((matrix.shape[0], width))
+        return {
+            "genres": genres,
+            "item_ids": item_ids,
+            "item_index": item_index,
+            "matrix": sp.vstack([matrix, appended], format="csr"),
+        }
+    
+    async def merge_pending(self) -> None:
+        """Fold queued movies into the matrix on a worker thread."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        generation = self.generation
+        state = {
+            "terms": self.terms,
+            "genres": self.genres,
+            "document_frequency": self.document_frequency,
+            "documents": self.documents,
+            "item_ids": self.item_ids,
+            "item_index": self.item_index,
+            "matrix": self.matrix,
+        }
+        merged = await asyncio.to_thread(self._merged, state, pending)
+        if generation != self.generation:
+            # A rebuild was installed meanwhile; merge into that one instead
+            if not self.needs_rebuild:
+                self._pending = pending + self._pending
+            return
+        for name, value in merged.items():
+            setattr(self, name, value)
+    
+    def similar_many(self, movie_ids: List[str], limit: int) -> List[List[str]]:
+        """Top-limit neighbours for each movie, from one batched product."""
+        rows = [self.item_index.get(movie_id) for movie_id in movie_ids]
+        known = [row for row in rows if row is not None]
+        if not known:
+            return [[] for _ in movie_ids]
+        
+        # Sparse catalog times a dense block of query vectors
+        scores = self.matrix @ self.matrix[known].toarray().T
+        results = {}
+        for column, row in enumerate(known):
+            column_scores = scores[:, column]
+            column_scores[row] = -1.0
+            k = min(limit, len(column_scores) - 1)
+            if k <= 0:
+                results[row] = []
+                continue
+            top = np.argpartition(column_scores, -k)[-k:]
+            top = top[np.argsort(-column_scores[top])]
+            results[row] = [self.item_ids[i] for i in top if column_scores[i] > 0]
+        return [results.get(row, []) if row is not None else [] for row in rows]
+    
+    def similar(self, movie_id: str, limit: int) -> List[str]:
+        return self.similar_many([movie_id], limit)[0]
+    
+    def stats(self) -> dict:
+        return {
+            "items": len(self.item_index),
+            "terms": len(self.terms),
+            "genres": len(self.genres),
+            "nnz": self.matrix.nnz,
+            "pending": len(self._pending),
+            "appended_since_build": self.appended_since_build,
+        }
+
+content_index = ContentIndex()
+content_rebuild_lock = asyncio.Lock()
+
+async def rebuild_content_index() -> None:
+    # Movies added once the snapshot read starts may be missing from it, so
+    # they are queued again on top of the new index
+    content_index.begin_rebuild()
+    try:
+        movies = await db.movies.find({}, {"_id": 0, "id": 1, "title": 1, "description": 1, "genre": 1}).to_list(None)
+        content_index.install(await asyncio.to_thread(content_index.compute, movies))
+    finally:
+        content_index.abort_rebuild()
+
+async def refresh_content_index() -> None:
+    async with content_rebuild_lock:
+        if content_index.needs_rebuild:
+            await rebuild_content_index()
+        await content_index.merge_pending()
+
+async def run_content_rebuild() -> None:
+    try:
+        await refresh_content_index()
+    except Exception:
+        logger.exception("Content index rebuild failed, retrying on next query")
+
+content_rebuild_task = None
+
+async def content_similar(movie_id: str, limit: int) -> List[str]:
+    global content_rebuild_task
+    if content_index.needs_rebuild:
+        # Full rebuilds run in the background; queries keep reading the
+        # current index until install() swaps the new one in
+        if content_rebuild_task is None or content_rebuild_task.done():
+            content_rebuild_task = asyncio.create_task(run_content_rebuild())
+    elif content_index.has_pending() and not content_rebuild_lock.locked():
+        await refresh_content_index()
+    return content_index.similar(movie_id, limit)
+
+# ==================== Leaderboards ====================
+
+# Event weights for trending scores
+TRENDING_WATCH_WEIGHT = 1.0
+TRENDING_FAVORITE_WEIGHT = 3.0
+TRENDING_REVIEW_WEIGHT = 2.0
+
+class TopN:
+    """The size highest-scoring movies, kept sorted as scores change.
+
+    Scores only ever have to be compared, never scanned: an update touches the
+    movie's own entry and at most one evicted entry. Readers get a cached
+    best-first id list.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._entries = []  # ascending (score, movie_id)
+        self._scores = {}
+        self.ids = []
+    
+    def replace(self, scores: dict) -> None:
+        best = heapq.nlargest(self.size, ((score, movie_id) for movie_id, score in scores.items()))
+        self._entries = best[::-1]
+        self._scores = {movie_id: score for score, movie_id in best}
+        self.ids = [movie_id for _, movie_id in best]
+    
+    def update(self, movie_id: str, score: float) -> bool:
+        """Apply a new score; returns False if a full recompute is needed."""
+        # Entries compare as (score, movie_id) everywhere, like replace(), so
+        # ties resolve the same way incrementally as in a full recompute
+        entry = (score, movie_id)
+        old = self._scores.pop(movie_id, None)
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, (old, movie_id))]
+            # On a full board a lowered score may fall below untracked movies.
+            # It is safe only while it stays above the remaining cut-off.
+            if (len(self._entries) + 1 >= self.size and score < old
+                    and (not self._entries or entry < self._entries[0])):
+                return False
+        elif len(self._entries) >= self.size:
+            if entry < self._entries[0]:
+                return True
+            _, evicted = self._entries.pop(0)
+            del self._scores[evicted]
+        bisect.insort(self._entries, entry)
+        self._scores[movie_id] = score
+        self.ids = [movie_id for _, movie_id in reversed(self._entries)]
+        return True
+
+class TrendingLeaderboard:
+    """Exponentially time-decayed engagement scores per movie.
+
+    Rather than decaying every score as time passes, each event is weighted
+    by 2 ** ((t - epoch) / half_life), which preserves ordering exactly. The
+    epoch is moved forward (rescaling all scores) before the weights get
+    large.
+    """
+    
+    def __init__(self, half_life_seconds: float, size: int):
+        self.half_life = half_life_seconds
+        self.epoch = time.time()
+        self.scores = {}
+        self.top = TopN(size)
+    
+    def _growth(self, at: float) -> float:
+        return 2.0 ** ((at - self.epoch) / self.half_life)
+    
+    def _rebase(self, at: float) -> None:
+        factor = self._growth(at)
+        self.epoch = at
+        self.scores = {movie_id: score / factor for movie_id, score in self.scores.items()}
+        self.top.replace(self.scores)
+    
+    def load(self, scores: dict, epoch: float) -> None:
+        self.epoch = epoch
+        self.scores = scores
+        self.top.replace(scores)
+    
+    def record(self, movie_id: str, weight: float) -> None:
+        now = time.time()
+        if now - self.epoch > 50 * self.half_life:
+            self._rebase(now)
+        score = self.scores.get(movie_id, 0.0) + weight * self._growth(now)
+        self.scores[movie_id] = score
+        if not self.top.update(movie_id, score):
+            self.top.replace(self.scores)
+    
+    def decayed_score(self, movie_id: str) -> float:
+        return self.scores.get(movie_id, 0.0) / self._growth(time.time())
+
+class TopRatedLeaderboard:
+    """Movies ranked by Bayesian-weighted rating.
+
+    weighted = (rating_sum + m * C) / (rating_count + m), where C is the mean
+    rating across all reviews and m is BAYESIAN_PRIOR_COUNT, so a movie needs
+    many reviews before its own average dominates the prior.
+    """
+    
+    def __init__(self, prior_count: float, size: int):
+        self.prior_count = prior_count
+        self.ratings = {}
+        self.total_sum = 0.0
+        self.total_count = 0
+        self.top = TopN(size)
+    
+    @property
+    def mean(self) -> float:
+        return self.total_sum / self.total_count if self.total_count else 0.0
+    
+    def weighted(self, rating_sum: float, rating_count: int) -> float:
+        return (rating_sum + self.prior_count * self.mean) / (rating_count + self.prior_count)
+    
+    def _all_weighted(self) -> dict:
+        return {movie_id: self.weighted(*totals) for movie_id, totals in self.ratings.items()}
+    
+    def load(self, ratings: dict) -> None:
+        self.ratings = ratings
+        self.total_sum = sum(total for total, _ in ratings.values())
+        self.total_count = sum(count for _, count in ratings.values())
+        self.top.replace(self._all_weighted())
+    
+    def record(self, movie_id: str, rating: int) -> None:
+        # The global mean shifts slightly too; other movies pick that up on reseed
+        rating_sum, rating_count = self.ratings.get(movie_id, (0.0, 0))
+        self.ratings[movie_id] = (rating_sum + rating, rating_count + 1)
+        self.total_sum += rating
+        self.total_count += 1
+        if not self.top.update(movie_id, self.weighted(*self.ratings[movie_id])):
+            self.top.replace(self._all_weighted())
+
+trending = TrendingLeaderboard(TRENDING_HALF_LIFE_HOURS * 3600, LEADERBOARD_SIZE)
+top_rated = TopRatedLeaderboard(BAYESIAN_PRIOR_COUNT, LEADERBOARD_SIZE)
+
+async def seed_leaderboards() -> None:
+    """Recompute both leaderboards from MongoDB, one aggregation per source."""
+    epoch = time.time()
+    epoch_date = datetime.fromtimestamp(epoch, timezone.utc)
+    cutoff = epoch_date - timedelta(days=TRENDING_LOOKBACK_DAYS)
+    half_life_ms = TRENDING_HALF_LIFE_HOURS * 3600 * 1000
+    
+    scores = Counter()
+    for collection, field, weight in (
+        (db.watch_history, "watched_at", TRENDING_WATCH_WEIGHT),
+        (db.favorites, "created_at", TRENDING_FAVORITE_WEIGHT),
+        (db.reviews, "created_at", TRENDING_REVIEW_WEIGHT),
+    ):
+        # Decay is applied server-side so only one row per movie comes back
+        async for row in collection.aggregate([
+            {"$match": {field: {"$gte": cutoff}}},
+            {"$group": {
+                "_id": "$movie_id",
+                "score": {"$sum": {"$multiply": [weight, {"$pow": [
+                    2, {"$divide": [{"$subtract": [f"${field}", epoch_date]}, half_life_ms]}
+                ]}]}},
+            }},
+        ]):
+            scores[row["_id"]] += row["score"]
+    trending.load(dict(scores), epoch)
+    
+    ratings = {}
+    async for movie in db.movies.find(
+        {"rating_count": {"$gt": 0}},
+        {"_id": 0, "id": 1, "rating_sum": 1, "rating_avg": 1, "rating_count": 1}
+    ):
+        # Movies reviewed before rating_sum existed only carry the average
+        rating_sum = movie.get("rating_sum", movie["rating_avg"] * movie["rating_count"])
+        ratings[movie["id"]] = (rating_sum, movie["rating_count"])
+    top_rated.load(ratings)
+
+leaderboard_task = None
+
+async def run_leaderboard_reseed() -> None:
+    # Reseeding also folds in events recorded by other workers
+    while True:
+        try:
+            await seed_leaderboards()
+        except Exception:
+            logger.exception("Leaderboard reseed failed")
+        await asyncio.sleep(LEADERBOARD_RESEED_SECONDS)
+
+# ==================== Watch History Buffer ====================
+
+class WatchHistoryBuffer:
+    """Coalesces watch-history progress updates in memory.
+
+    Only the latest progress per (user_id, movie_id) is kept. Entries are
+    written as one unordered bulk_write of upserts every flush_interval
+    seconds, or as soon as max_size keys are pending, and drained on shutdown.
+    """
+    
+    def __init__(self, flush_interval: float, max_size: int):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._pending = {}
+        self._by_user = {}
+        self._in_flight = {}
+        self._in_flight_by_user = {}
+        self._wake = asyncio.Event()
+        self._task = None
+        self._closing = False
+        self.flushes = 0
+        self.flushed = 0
+        self.coalesced = 0
+    
+    def record(self, user_id: str, movie_id: str, progress: int) -> None:
+        key = (user_id, movie_id)
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = {
+            "progress": progress,
+            "watched_at": datetime.now(timezone.utc),
+        }
+        self._by_user.setdefault(user_id, set()).add(movie_id)
+        if len(self._pending) >= self.max_size:
+            self._wake.set()
+    
+    def pending_for(self, user_id: str) -> dict:
+        """Buffered rows for a user, keyed by movie id, including any being flushed."""
+        rows = {}
+        # Newer buffered values win over ones in the write still in flight
+        for entries, by_user in ((self._in_flight, self._in_flight_by_user), (self._pending, self._by_user)):
+            for movie_id in by_user.get(user_id, ()):
+                rows[movie_id] = {"user_id": user_id, "movie_id": movie_id, **entries[(user_id, movie_id)]}
+        return rows
+    
+    def _requeue(self, pending: dict) -> None:
+        # Keep anything recorded during the failed write, it is newer
+        for (user_id, movie_id), values in pending.items():
+            if (user_id, movie_id) not in self._pending:
+                self._pending[(user_id, movie_id)] = values
+                self._by_user.setdefault(user_id, set()).add(movie_id)
+    
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, by_user = self._pending, self._by_user
+        self._pending, self._by_user = {}, {}
+        # Rows stay visible to pending_for until they are readable from Mongo
+        self._in_flight, self._in_flight_by_user = pending, by_user
+        ops = [
+            UpdateOne(
+                {"user_id": user_id, "movie_id": movie_id},
+                {
+                    "$set": values,
+                    "$setOnInsert": {"id": str(uuid.uuid4())},
+                },
+                upsert=True
+            )
+            for (user_id, movie_id), values in pending.items()
+        ]
+        try:
+            result = await db.watch_history.bulk_write(ops, ordered=False)
+        except asyncio.CancelledError:
+            # Cancelled mid-write: the batch may not be stored, keep it for the next drain
+            self._requeue(pending)
+            raise
+        except Exception:
+            logger.exception("Watch history flush failed, requeueing %d entries", len(ops))
+            self._requeue(pending)
+            return
+        finally:
+            self._in_flight, self._in_flight_by_user = {}, {}
+        # Only newly created rows count towards trending, as in the reseed
+        keys = list(pending)
+        for index in result.upserted_ids:
+            trending.record(keys[index][1], TRENDING_WATCH_WEIGHT)
+        self.flushes += 1
+        self.flushed += len(ops)
+    
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let the loop finish a flush already in progress instead of cancelling it
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+    
+    def stats(self) -> dict:
+        return {
+            "enabled": WATCH_HISTORY_WRITE_BEHIND,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "coalesced": self.coalesced,
+        }
+
+watch_history_buffer = WatchHistoryBuffer(WATCH_HISTORY_FLUSH_SECONDS, WATCH_HISTORY_FLUSH_SIZE)
+
+# ==================== Timestamp Migration ====================
+
+# Fields written as isoformat() strings before timestamps were stored as dates
+TIMESTAMP_FIELDS = [
+    ("users", "created_at"),
+    ("movies", "created_at"),
+    ("favorites", "created_at"),
+    ("watch_history", "watched_at"),
+    ("reviews", "created_at"),
+]
+
+TIMESTAMP_MIGRATION_ID = "timestamps_to_dates"
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+async def migrate_timestamp_field(collection_name: str, field: str) -> None:
+    """Convert one field's string timestamps to dates in _id order.
+
+    Progress (last _id and count) is checkpointed in the migrations
+    collection after every batch, so a restart resumes where it stopped.
+    """
+    key = f"{collection_name}:{field}"
+    state = await db.migrations.find_one({"_id": TIMESTAMP_MIGRATION_ID}) or {}
+    progress = state.get("progress", {}).get(key, {})
+    if progress.get("done"):
+        return
+    last_id = progress.get("last_id")
+    migrated = progress.get("migrated", 0)
+    collection = db[collection_name]
+    
+    while True:
+        query = {field: {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await collection.find(query, {"_id": 1, field: 1}).sort(
+            "_id", ASCENDING
+        ).limit(TIMESTAMP_MIGRATION_BATCH_SIZE).to_list(TIMESTAMP_MIGRATION_BATCH_SIZE)
+        if not batch:
+            break
+        
+        ops = []
+        for doc in batch:
+            parsed = parse_timestamp(doc[field])
+            if parsed is None:
+                logger.warning("Skipping unparseable %s on %s", key, doc["_id"])
+                continue
+            # Matching the old value leaves rows rewritten meanwhile untouched
+            ops.append(UpdateOne({"_id": doc["_id"], field: doc[field]}, {"$set": {field: parsed}}))
+        if ops:
+            result = await collection.bulk_write(ops, ordered=False)
+            migrated += result.modified_count
+        
+        last_id = batch[-1]["_id"]
+        await db.migrations.update_one(
+            {"_id": TIMESTAMP_MIGRATION_ID},
+            {"$set": {f"progress.{key}": {"last_id": last_id, "migrated": migrated, "done": False}}},
+            upsert=True
+        )
+        # Yield to request traffic between batches
+        await asyncio.sleep(TIMESTAMP_MIGRATION_PAUSE_SECONDS)
+    
+    await db.migrations.update_one(
+        {"_id": TIMESTAMP_MIGRATION_ID},
+        {"$set": {f"progress.{key}": {"last_id": last_id, "migrated": migrated, "done": True}}},
+        upsert=True
+    )
+
+async def migrate_timestamps() -> None:
+    try:
+        for collection_name, field in TIMESTAMP_FIELDS:
+            await migrate_timestamp_field(collection_name, field)
+        await db.migrations.update_one(
+            {"_id": TIMESTAMP_MIGRATION_ID},
+            {"$set": {"completed_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        invalidate_catalog()
+        logger.info("Timestamp migration complete")
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("Timestamp migration failed, it will resume on next start")
+
+timestamp_migration_task = None
+
+# ==================== Pagination ====================
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Larger /movies limits are clamped rather than rejected; older clients sent them
+MOVIE_PAGE_MAX_LIMIT = 100
+
+def _encode_cursor_value(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+def _decode_cursor_value(obj: dict):
+    if obj.keys() == {"$date"}:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(',', ':'), default=_encode_cursor_value).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw, object_hook=_decode_cursor_value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_query(query: dict, sort_field: str, cursor: Optional[str]) -> dict:
+    """Restrict query to rows after the cursor in (sort_field, id) descending order."""
+    query = dict(query)
+    if cursor:
+        values = decode_cursor(cursor)
+        # Anything but plain values would reach Mongo as an operator expression
+        if (len(values) != 2 or not isinstance(values[0], (datetime, str))
+                or not isinstance(values[1], str)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        last_value, last_id = values
+        query['$or'] = [
+            {sort_field: {'$lt': last_value}},
+            {sort_field: last_value, 'id': {'$lt': last_id}},
+        ]
+        if isinstance(last_value, datetime):
+            # Until the timestamp migration finishes, rows still holding ISO
+            # strings sort after every date in descending order
+            query['$or'].append({sort_field: {'$type': 'string'}})
+    return query
+
+def trim_page(docs: list, sort_field: str, limit: int, id_field: str = 'id') -> tuple:
+    """Cut a limit + 1 fetch down to limit and build the next page cursor."""
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor([last[sort_field], last[id_field]])
+    return docs, next_cursor
+
+async def fetch_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None
+) -> tuple:
+    """Keyset page over (sort_field, id), newest first.
+
+    Returns the documents and the cursor for the next page (None on the last
+    page). The cursor holds the last row's sort key, so every page is a single
+    index range scan no matter how deep the client pages.
+    """
+    projection = dict(projection or {"_id": 0})
+    docs = await collection.find(keyset_query(query, sort_field, cursor), projection).sort(
+        [(sort_field, DESCENDING), ('id', DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+    return trim_page(docs, sort_field, limit)
+
+async def fetch_movie_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    limit: int,
+    cursor: Optional[str],
+    extra_fields: dict
+) -> tuple:
+    """Keyset page of a user's favorites/history rows joined to their movies.
+
+    One aggregation: the page is cut on the (user_id, sort_field, id) index,
+    then each row is joined to its movie with $lookup, so recency order is
+    kept. Rows are projected to MOVIE_CARD_PROJECTION plus extra_fields, and
+    still carry sort_field and row_id for building the next cursor. Rows
+    whose movie no longer exists are dropped after the cursor is built.
+    """
+    docs = await collection.aggregate([
+        {"$match": keyset_query(query, sort_field, cursor)},
+        {"$sort": {sort_field: -1, "id": -1}},
+        {"$limit": limit + 1},
+        {"$lookup": {
+            "from": "movies",
+            "localField": "movie_id",
+            "foreignField": "id",
+            "as": "movie",
+        }},
+        # Keep rows whose movie is gone until the cursor is cut, so a
+        # dangling row can't make a full page look like the last one
+        {"$unwind": {"path": "$movie", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "_id": 0,
+            "row_id": "$id",
+            sort_field: 1,
+            **{field: f"$movie.{field}" for field in MOVIE_CARD_PROJECTION},
+            **extra_fields,
+        }},
+    ]).to_list(limit + 1)
+    docs, next_cursor = trim_page(docs, sort_field, limit, id_field='row_id')
+    return [doc for doc in docs if 'id' in doc], next_cursor
+
+def render_json(content, adapter: Optional[TypeAdapter]) -> bytes:
+    """Render DB documents read with a model projection straight to JSON.
+
+    orjson encodes the documents directly, skipping FastAPI's response_model
+    validation and jsonable_encoder pass. With FAST_JSON_RESPONSES off, the
+    documents are validated through the pre-built adapter first.
+    """
+    with SERIALIZATION_SECONDS.time():
+        if adapter is not None and not FAST_JSON_RESPONSES:
+            content = adapter.dump_python(adapter.validate_python(content), mode="json")
+        return ORJSONResponse(content).body
+
+def json_response(content, adapter: TypeAdapter, next_cursor: Optional[str] = None) -> Response:
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(render_json(content, adapter), media_type="application/json", headers=headers)
+
+# ==================== HTTP Caching ====================
+
+class CachedResponse:
+    """A rendered catalog response with its validators.
+
+    The ETag is a hash of the body, so it is strong and identical across
+    workers. It is computed once when the response is built; conditional
+    requests served from the in-process cache never reach MongoDB.
+    """
+    
+    __slots__ = ("body", "etag", "last_modified", "next_cursor", "movie_ids")
+    
+    def __init__(self, body: bytes, next_cursor: Optional[str] = None, movie_ids: frozenset = frozenset()):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.next_cursor = next_cursor
+        # Movies listed in the body, so a single movie's change can find it
+        self.movie_ids = movie_ids
+
+def build_cached_response(
+    content,
+    adapter: Optional[TypeAdapter],
+    next_cursor: Optional[str] = None,
+    movie_ids: frozenset = frozenset()
+) -> CachedResponse:
+    return CachedResponse(render_json(content, adapter), next_cursor, movie_ids)
+
+def is_not_modified(request: Request, cached: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or cached.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return cached.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def conditional_response(request: Request, cached: CachedResponse, route: str) -> Response:
+    headers = {
+        "ETag": cached.etag,
+        "Last-Modified": format_datetime(cached.last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL[route],
+    }
+    if cached.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = cached.next_cursor
+    if is_not_modified(request, cached):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+# ==================== Catalog Ingest ====================
+
+# Fields an ingest may overwrite on an existing movie. Rating aggregates and
+# created_at belong to the running service and are only set on insert.
+INGEST_UPDATE_FIELDS = ("title", "description", "genre", "year", "duration", "poster_url", "trailer_url")
+INGEST_MAX_ERRORS = 20
+
+def decode_line(line: bytes):
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError as e:
+        return ValueError(f"Invalid UTF-8: {e}")
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator:
+    """Split a byte stream into decoded lines, holding at most one partial line.
+
+    A line that is not valid UTF-8 comes through as a ValueError, which the
+    row parsers pass on as a row error.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield decode_line(line)
+    if pending:
+        yield decode_line(pending)
+
+async def iter_ndjson_rows(lines: AsyncIterator) -> AsyncIterator:
+    async for line in lines:
+        if isinstance(line, ValueError):
+            yield line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+async def iter_csv_rows(lines: AsyncIterator) -> AsyncIterator:
+    """Parse CSV with a header row; genre is a |-separated list.
+
+    A record is complete once its quotes balance, so quoted fields may span
+    lines without buffering more than the current record.
+    """
+    header = None
+    record = []
+    async for line in lines:
+        if isinstance(line, ValueError):
+            # The record this line belonged to can't be parsed either
+            record = []
+            yield line
+            continue
+        record.append(line)
+        joined = "\n".join(record)
+        if joined.count('"') % 2:
+            continue
+        record = []
+        if not joined.strip():
+            continue
+        values = next(csv.reader([joined]))
+        if header is None:
+            header = [name.strip().lstrip("\ufeff") for name in values]
+            continue
+        if len(values) != len(header):
+            yield ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        row = {name: value for name, value in zip(header, values) if value != ""}
+        if "genre" in row:
+            row["genre"] = [g.strip() for g in row["genre"].split("|") if g.strip()]
+        yield row
+    if record:
+        yield ValueError("Unterminated quoted field at end of input")
+
+def ingest_operation(movie: dict) -> UpdateOne:
+    return UpdateOne(
+        {"id": movie["id"]},
+        {
+            "$set": {field: movie[field] for field in INGEST_UPDATE_FIELDS},
+            "$setOnInsert": {
+                field: value for field, value in movie.items()
+                if field not in INGEST_UPDATE_FIELDS and field != "id"
+            },
+        },
+        upsert=True
+    )
+
+async def ingest_movies(rows: AsyncIterator) -> dict:
+    """Validate rows against Movie and upsert them in unordered batches.
+
+    rows is consumed lazily and only one batch of operations is held at a
+    time, so memory stays flat regardless of input size.
+    """
+    report = {"rows": 0, "inserted": 0, "matched": 0, "modified": 0, "invalid": 0, "errors": []}
+    started = time.perf_counter()
+    ops = []
+    movies = []
+    
+    def record_error(message: str) -> None:
+        report["invalid"] += 1
+        if len(report["errors"]) < INGEST_MAX_ERRORS:
+            report["errors"].append({"row": report["rows"], "error": message})
+    
+    async def flush() -> None:
+        try:
+            result = (await db.movies.bulk_write(ops, ordered=False)).bulk_api_result
+        except BulkWriteError as e:
+            result = e.details
+            for error in result["writeErrors"]:
+                record_error(error["errmsg"])
+        report["inserted"] += result["nUpserted"]
+        report["matched"] += result["nMatched"]
+        report["modified"] += result["nModified"]
+        # Only rows MongoDB accepted go into the in-memory indexes
+        failed = {error["index"] for error in result.get("writeErrors", [])}
+        written = [movie for i, movie in enumerate(movies) if i not in failed]
+        movie_id_index.add(movie["id"] for movie in written)
+        content_index.add(written)
+        ops.clear()
+        movies.clear()
+    
+    async for row in rows:
+        report["rows"] += 1
+        if isinstance(row, Exception):
+            record_error(str(row))
+            continue
+        if not isinstance(row, dict):
+            record_error("Row must be an object")
+            continue
+        try:
+            movie = Movie(**row).model_dump()
+        except ValidationError as e:
+            record_error("; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            ))
+            continue
+        ops.append(ingest_operation(movie))
+        movies.append(movie)
+        if len(ops) >= INGEST_BATCH_SIZE:
+            await flush()
+    if ops:
+        await flush()
+    
+    # Updated rows may have changed genres, so recount rather than adjust
+    await rebuild_genre_catalog()
+    invalidate_catalog()
+    
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["rows"] / elapsed) if elapsed > 0 else None
+    return report
+
+# ==================== Export ====================
+
+# Collections that can be exported, with the model naming their fields.
+# users is left out since it holds password hashes
+EXPORTABLE_COLLECTIONS = {
+    "movies": Movie,
+    "reviews": Review,
+    "watch_history": WatchHistory,
+    "favorites": Favorite,
+}
+
+def export_projection(collection_name: str, fields: Optional[str]) -> dict:
+    projection = {"_id": 0}
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        # Only known top-level fields: _id would not encode, and paths or
+        # operators could collide with the projection mid-stream
+        known = EXPORTABLE_COLLECTIONS[collection_name].model_fields
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {unknown[0]}")
+        # id is always included so the client can resume
+        projection.update({name: 1 for name in names}, id=1)
+    return projection
+
+async def stream_ndjson(collection, projection: dict, after: Optional[str]) -> AsyncIterator[bytes]:
+    """Yield documents in id order as NDJSON, EXPORT_BATCH_SIZE per chunk.
+
+    Reads straight off a Motor cursor over the id index, so only one batch is
+    held in memory and the event loop is released between batches. Passing
+    the last exported id as after resumes an interrupted export.
+    """
+    query = {"id": {"$gt": after}} if after else {}
+    cursor = collection.find(query, projection).sort("id", ASCENDING).batch_size(EXPORT_BATCH_SIZE)
+    chunk = []
+    async for doc in cursor:
+        chunk.append(orjson.dumps(doc))
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+# ==================== Indexes ====================
+
+# Every query issued by the routes below must be backed by one of these.
+# Names are explicit so the report can compare declared vs. existing indexes.
+INDEX_SPECS = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "movies": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("genre", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="genre_created_at_id"),
+        # Titles are weighted so a title hit outranks a description hit.
+        # No language: catalog text is mixed-language, so skip stemming/stop words.
+        IndexModel(
+            [("title", TEXT), ("description", TEXT)],
+            name="title_description_text",
+            weights={"title": 10, "description": 1},
+            default_language="none",
+        ),
+    ],
+    "genres": [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+    ],
+    "favorites": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+        IndexModel([("user_id", ASCENDING), ("movie_id", ASCENDING)], name="user_movie_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="user_created_at_id"),
+    ],
+    "watch_history": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("watched_at", DESCENDING)], name="watched_at"),
+        IndexModel([("user_id", ASCENDING), ("movie_id", ASCENDING)], name="user_movie_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("watched_at", DESCENDING), ("id", DESCENDING)], name="user_watched_at_id"),
+    ],
+    "reviews": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+        IndexModel([("user_id", ASCENDING), ("movie_id", ASCENDING)], name="user_movie_unique", unique=True),
+        IndexModel([("movie_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="movie_created_at_id"),
+    ],
+}
+
+# Unique indexes the write paths rely on to reject duplicates, with the
+# field deciding which copy survives when existing data has duplicates
+DEDUPED_UNIQUE_INDEXES = {
+    ("favorites", "user_movie_unique"): ("created_at", ASCENDING),
+    ("watch_history", "user_movie_unique"): ("watched_at", DESCENDING),
+    ("reviews", "user_movie_unique"): ("created_at", ASCENDING),
+}
+DUPLICATE_KEY_ERROR = 11000
+
+async def remove_duplicates(collection, keys: List[str], sort_field: str, direction: int) -> int:
+    """Keep one document per key combination (the first in sort order); returns the number removed."""
+    removed = 0
+    async for group in collection.aggregate([
+        {"$sort": {sort_field: direction, "_id": ASCENDING}},
+        {"$group": {"_id": {key: f"${key}" for key in keys}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True):
+        result = await collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    return removed
+
+async def ensure_indexes() -> None:
+    """Create all declared indexes. Safe to run on every startup.
+
+    Duplicates blocking one of DEDUPED_UNIQUE_INDEXES are removed and the
+    index retried; if it still can't be built, startup fails rather than
+    serving writes that would accept duplicates.
+    """
+    for collection_name, indexes in INDEX_SPECS.items():
+        collection = db[collection_name]
+        for index in indexes:
+            name = index.document["name"]
+            # One at a time so a single failure (e.g. duplicates blocking a
+            # unique index) doesn't prevent the remaining indexes from building
+            try:
+                await collection.create_indexes([index])
+                continue
+            except OperationFailure as e:
+                dedupe = DEDUPED_UNIQUE_INDEXES.get((collection_name, name))
+                if dedupe is None or e.code != DUPLICATE_KEY_ERROR:
+                    logger.error("Failed to create index %s.%s: %s", collection_name, name, e)
+                    continue
+
+            keys = list(index.document["key"])
+            removed = await remove_duplicates(collection, keys, *dedupe)
+            logger.warning("Removed %d duplicate %s rows to build %s", removed, collection_name, name)
+            if collection_name == "reviews" and removed:
+                await rebuild_rating_aggregates()
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                raise RuntimeError(f"Required index {collection_name}.{name} could not be built: {e}") from e
+
+async def build_index_report() -> dict:
+    report = {}
+    for collection_name, indexes in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        declared = {index.document["name"] for index in indexes}
+
+        usage = {}
+        try:
+            async for stat in collection.aggregate([{"$indexStats": {}}]):
+                usage[stat["name"]] = stat["accesses"]["ops"]
+        except OperationFailure:
+            # $indexStats is unavailable on some deployments
+            pass
+
+        report[collection_name] = {
+            "missing": sorted(declared - existing.keys()),
+            "undeclared": sorted(existing.keys() - declared - {"_id_"}),
+            "unused": sorted(
+                name for name, ops in usage.items()
+                if ops == 0 and name != "_id_"
+            ),
+            "usage": usage,
+        }
+    return report
+
 # ==================== Auth Routes ====================
 
 @api_router.post("/auth/register", response_model=Token)
@@ -153,13 +2292,12 @@ async def register(user_data: UserCreate):
     )
     
     user_dict = user.model_dump()
-    user_dict['password'] = hash_password(user_data.password)
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
+    user_dict['password'] = await hash_password_async(user_data.password)
     
     await db.users.insert_one(user_dict)
     
     # Create token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data=token_claims(user))
     
     return Token(access_token=access_token, token_type="bearer", user=user)
 
@@ -171,94 +2309,177 @@ async def login(login_data: UserLogin):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Verify password
-    if not verify_password(login_data.password, user_doc['password']):
+    if not await verify_password_async(login_data.password, user_doc['password']):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Convert to User model
     user_doc.pop('password')
     user_doc.pop('_id', None)
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
     
     user = User(**user_doc)
     
     # Create token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data=token_claims(user))
     
     return Token(access_token=access_token, token_type="bearer", user=user)
 
 @api_router.get("/auth/me", response_model=User)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    if isinstance(current_user['created_at'], str):
-        current_user['created_at'] = datetime.fromisoformat(current_user['created_at'])
     return User(**current_user)
 
 # ==================== Movie Routes ====================
 
-@api_router.get("/movies", response_model=List[Movie])
-async def get_movies(
-    search: Optional[str] = None,
-    genre: Optional[str] = None,
-    limit: int = 100
-):
+async def query_movies(
+    search: Optional[str],
+    genre: Optional[str],
+    limit: int,
+    offset: int,
+    cursor: Optional[str]
+) -> tuple:
     query = {}
     
-    if search:
-        query['$or'] = [
-            {'title': {'$regex': search, '$options': 'i'}},
-            {'description': {'$regex': search, '$options': 'i'}}
-        ]
-    
     if genre:
         query['genre'] = {'$in': [genre]}
     
-    movies = await db.movies.find(query, {"_id": 0}).limit(limit).to_list(limit)
+    if search:
+        # Served by the title_description_text index, ranked by relevance.
+        # Relevance has no stable keyset, so search cursors carry an offset.
+        query['$text'] = {'$search': search}
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            offset = values[0]
+        
+        movies = await db.movies.find(query, MOVIE_PROJECTION).sort(
+            [('score', {'$meta': 'textScore'}), ('id', ASCENDING)]
+        ).skip(offset).limit(limit + 1).to_list(limit + 1)
+        
+        next_cursor = None
+        if len(movies) > limit:
+            movies = movies[:limit]
+            next_cursor = encode_cursor([offset + limit])
+    elif offset:
+        movies = await db.movies.find(query, MOVIE_PROJECTION).sort(
+            [('created_at', DESCENDING), ('id', DESCENDING)]
+        ).skip(offset).limit(limit).to_list(limit)
+        next_cursor = None
+    else:
+        movies, next_cursor = await fetch_page(
+            db.movies, query, 'created_at', limit, cursor, projection=MOVIE_PROJECTION
+        )
     
-    for movie in movies:
-        if isinstance(movie['created_at'], str):
-            movie['created_at'] = datetime.fromisoformat(movie['created_at'])
+    return movies, next_cursor
+
+@api_router.get("/movies", response_model=List[Movie])
+async def get_movies(
+    request: Request,
+    search: Optional[str] = None,
+    genre: Optional[str] = None,
+    limit: int = Query(MOVIE_PAGE_MAX_LIMIT, ge=1),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None
+):
+    limit = min(limit, MOVIE_PAGE_MAX_LIMIT)
+    search = normalize_search(search)
+    cache_key = ("movies", search, genre, limit, offset, cursor)
+    
+    cached = catalog_query_cache.get(cache_key)
+    if cached is None:
+        movies, next_cursor = await query_movies(search, genre, limit, offset, cursor)
+        cached = build_cached_response(
+            movies, MOVIE_LIST_ADAPTER, next_cursor, frozenset(movie['id'] for movie in movies)
+        )
+        catalog_query_cache.set(cache_key, cached)
     
-    return movies
+    return conditional_response(request, cached, "movies")
+
+@api_router.get("/movies/trending", response_model=List[Movie])
+async def get_trending_movies(limit: int = Query(20, ge=1, le=LEADERBOARD_SIZE)):
+    ids = trending.top.ids[:limit]
+    found = await resolve_movies(ids)
+    return json_response([found[i] for i in ids if i in found], MOVIE_LIST_ADAPTER)
+
+@api_router.get("/movies/top-rated", response_model=List[Movie])
+async def get_top_rated_movies(limit: int = Query(20, ge=1, le=LEADERBOARD_SIZE)):
+    ids = top_rated.top.ids[:limit]
+    found = await resolve_movies(ids)
+    return json_response([found[i] for i in ids if i in found], MOVIE_LIST_ADAPTER)
 
 @api_router.get("/movies/{movie_id}", response_model=Movie)
-async def get_movie(movie_id: str):
-    movie = await db.movies.find_one({"id": movie_id}, {"_id": 0})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    
-    if isinstance(movie['created_at'], str):
-        movie['created_at'] = datetime.fromisoformat(movie['created_at'])
+async def get_movie(movie_id: str, request: Request):
+    cached = catalog_query_cache.get(("movie", movie_id))
+    if cached is None:
+        movie = movie_cache.get(movie_id)
+        if movie is None:
+            movie = await db.movies.find_one({"id": movie_id}, MOVIE_PROJECTION)
+            if not movie:
+                raise HTTPException(status_code=404, detail="Movie not found")
+            movie_cache.set(movie_id, movie)
+        cached = build_cached_response(movie, MOVIE_ADAPTER)
+        catalog_query_cache.set(("movie", movie_id), cached)
     
-    return Movie(**movie)
+    return conditional_response(request, cached, "movie")
+
+@api_router.post("/movies/batch", response_model=MovieBatchResponse)
+async def get_movies_batch(batch: MovieBatchRequest):
+    found = await resolve_movies(batch.ids)
+    return json_response({
+        "movies": [found.get(movie_id) for movie_id in batch.ids],
+        "not_found": [movie_id for movie_id in dict.fromkeys(batch.ids) if movie_id not in found],
+    }, MOVIE_BATCH_ADAPTER)
+
+@api_router.get("/movies/{movie_id}/similar", response_model=List[Movie])
+async def get_similar_movies(movie_id: str, limit: int = Query(10, ge=1, le=50)):
+    ids = recommendations.similar(movie_id, limit)
+    if len(ids) < limit:
+        # Too few interactions (e.g. a new title): fill up from content similarity
+        ids += [i for i in await content_similar(movie_id, limit) if i not in ids][:limit - len(ids)]
+    found = await resolve_movies(ids)
+    return json_response([found[i] for i in ids if i in found], MOVIE_LIST_ADAPTER)
+
+@api_router.get("/movies/{movie_id}/more-like-this", response_model=List[Movie])
+async def get_more_like_this(movie_id: str, limit: int = Query(10, ge=1, le=50)):
+    ids = await content_similar(movie_id, limit)
+    found = await resolve_movies(ids)
+    return json_response([found[i] for i in ids if i in found], MOVIE_LIST_ADAPTER)
 
 @api_router.get("/genres")
-async def get_genres():
-    # Get all unique genres
-    movies = await db.movies.find({}, {"genre": 1, "_id": 0}).to_list(1000)
-    genres = set()
-    for movie in movies:
-        genres.update(movie.get('genre', []))
-    return {"genres": sorted(list(genres))}
+async def get_genres(request: Request):
+    cached = catalog_query_cache.get(("genres",))
+    if cached is None:
+        # Maintained by adjust_genre_counts, read in name order off name_unique
+        genres = await db.genres.find(
+            {"movie_count": {"$gt": 0}},
+            {"_id": 0, "name": 1, "movie_count": 1}
+        ).sort("name", ASCENDING).to_list(None)
+        result = {
+            "genres": [g['name'] for g in genres],
+            "counts": {g['name']: g['movie_count'] for g in genres},
+        }
+        cached = build_cached_response(result, None)
+        catalog_query_cache.set(("genres",), cached)
+    
+    return conditional_response(request, cached, "genres")
 
 # ==================== Favorites Routes ====================
 
-@api_router.get("/favorites", response_model=List[Movie])
-async def get_favorites(current_user: dict = Depends(get_current_user)):
-    # Get user's favorites
-    favorites = await db.favorites.find({"user_id": current_user['id']}, {"_id": 0}).to_list(1000)
-    movie_ids = [fav['movie_id'] for fav in favorites]
-    
-    if not movie_ids:
-        return []
-    
-    # Get movies
-    movies = await db.movies.find({"id": {"$in": movie_ids}}, {"_id": 0}).to_list(1000)
-    
+@api_router.get("/favorites", response_model=List[FavoriteMovie])
+async def get_favorites(
+    # Unpaged clients still get everything the endpoint returned before paging
+    limit: int = Query(1000, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    # Get a page of the user's favorites joined to their movies, newest first
+    movies, next_cursor = await fetch_movie_page(
+        db.favorites, {"user_id": current_user['id']}, 'created_at', limit, cursor,
+        extra_fields={"favorited_at": "$created_at"}
+    )
     for movie in movies:
-        if isinstance(movie['created_at'], str):
-            movie['created_at'] = datetime.fromisoformat(movie['created_at'])
+        del movie['row_id'], movie['created_at']
     
-    return movies
+    return json_response(movies, FAVORITE_MOVIE_LIST_ADAPTER, next_cursor)
 
 @api_router.post("/favorites")
 async def add_favorite(
@@ -266,31 +2487,43 @@ async def add_favorite(
     current_user: dict = Depends(get_current_user)
 ):
     # Check if movie exists
-    movie = await db.movies.find_one({"id": favorite_data.movie_id})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    
-    # Check if already in favorites
-    existing = await db.favorites.find_one({
-        "user_id": current_user['id'],
-        "movie_id": favorite_data.movie_id
-    })
-    if existing:
-        return {"message": "Already in favorites"}
+    await ensure_movie_exists(favorite_data.movie_id)
     
-    # Add to favorites
+    # Add to favorites unless already there, in a single round trip
     favorite = Favorite(
         user_id=current_user['id'],
         movie_id=favorite_data.movie_id
     )
     
     favorite_dict = favorite.model_dump()
-    favorite_dict['created_at'] = favorite_dict['created_at'].isoformat()
     
-    await db.favorites.insert_one(favorite_dict)
+    try:
+        result = await db.favorites.update_one(
+            {"user_id": favorite.user_id, "movie_id": favorite.movie_id},
+            {"$setOnInsert": favorite_dict},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Lost a race with a concurrent insert of the same favorite
+        return {"message": "Already in favorites"}
     
+    if result.upserted_id is None:
+        return {"message": "Already in favorites"}
+    
+    recommendations.record(favorite.user_id, favorite.movie_id, "favorite", FAVORITE_WEIGHT)
+    trending.record(favorite.movie_id, TRENDING_FAVORITE_WEIGHT)
     return {"message": "Added to favorites"}
 
+@api_router.get("/favorites/{movie_id}")
+async def get_favorite_status(
+    movie_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    favorite = await db.favorites.find_one(
+        {"user_id": current_user['id'], "movie_id": movie_id}, {"_id": 1}
+    )
+    return {"is_favorite": favorite is not None}
+
 @api_router.delete("/favorites/{movie_id}")
 async def remove_favorite(
     movie_id: str,
@@ -308,27 +2541,52 @@ async def remove_favorite(
 
 # ==================== Watch History Routes ====================
 
-@api_router.get("/watch-history", response_model=List[Movie])
-async def get_watch_history(current_user: dict = Depends(get_current_user)):
-    # Get user's watch history
-    history = await db.watch_history.find(
-        {"user_id": current_user['id']},
-        {"_id": 0}
-    ).sort("watched_at", -1).limit(50).to_list(50)
-    
-    movie_ids = [h['movie_id'] for h in history]
-    
-    if not movie_ids:
-        return []
+@api_router.get("/watch-history", response_model=List[WatchedMovie])
+async def get_watch_history(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    # Get a page of the user's watch history joined to their movies, most recent first
+    movies, next_cursor = await fetch_movie_page(
+        db.watch_history, {"user_id": current_user['id']}, 'watched_at', limit, cursor,
+        extra_fields={"progress": 1}
+    )
+    first_persisted = movies[0] if movies else None
     
-    # Get movies
-    movies = await db.movies.find({"id": {"$in": movie_ids}}, {"_id": 0}).to_list(1000)
+    # Overlay progress still sitting in the write-behind buffer. Buffered rows
+    # are the most recent, so they lead the first page and are dropped from
+    # any page the persisted copy would otherwise appear on.
+    pending = watch_history_buffer.pending_for(current_user['id'])
+    if pending:
+        movies = [m for m in movies if m['id'] not in pending]
+        if not cursor:
+            buffered = await db.movies.find(
+                {"id": {"$in": list(pending)}},
+                {"_id": 0, **{field: 1 for field in MOVIE_CARD_PROJECTION}}
+            ).to_list(len(pending))
+            for movie in buffered:
+                movie.update(pending[movie['id']])
+                del movie['user_id'], movie['movie_id']
+            buffered.sort(key=lambda m: m['watched_at'], reverse=True)
+            movies = buffered + movies
+            if len(movies) > limit:
+                movies = movies[:limit]
+                # Resume after the last persisted row still on the page. If
+                # the buffer filled it, resume at the first persisted row: an
+                # id just above it keeps that row inside the $lt bound. Buffered
+                # rows past limit only show once flushed, which needs more than
+                # limit distinct titles within one flush interval.
+                persisted = [m for m in movies if 'row_id' in m]
+                if persisted:
+                    next_cursor = encode_cursor([persisted[-1]['watched_at'], persisted[-1]['row_id']])
+                elif first_persisted is not None:
+                    next_cursor = encode_cursor([first_persisted['watched_at'], first_persisted['row_id'] + '\x00'])
     
     for movie in movies:
-        if isinstance(movie['created_at'], str):
-            movie['created_at'] = datetime.fromisoformat(movie['created_at'])
+        movie.pop('row_id', None)
     
-    return movies
+    return json_response(movies, WATCHED_MOVIE_LIST_ADAPTER, next_cursor)
 
 @api_router.post("/watch-history")
 async def add_watch_history(
@@ -336,52 +2594,70 @@ async def add_watch_history(
     current_user: dict = Depends(get_current_user)
 ):
     # Check if movie exists
-    movie = await db.movies.find_one({"id": history_data.movie_id})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
+    await ensure_movie_exists(history_data.movie_id)
     
-    # Check if already exists and update
-    existing = await db.watch_history.find_one({
-        "user_id": current_user['id'],
-        "movie_id": history_data.movie_id
-    })
+    recommendations.record(current_user['id'], history_data.movie_id, "watch", watch_weight(history_data.progress))
     
-    if existing:
-        await db.watch_history.update_one(
-            {"user_id": current_user['id'], "movie_id": history_data.movie_id},
-            {"$set": {
-                "watched_at": datetime.now(timezone.utc).isoformat(),
-                "progress": history_data.progress
-            }}
-        )
-    else:
-        history = WatchHistory(
-            user_id=current_user['id'],
-            movie_id=history_data.movie_id,
-            progress=history_data.progress
-        )
-        
-        history_dict = history.model_dump()
-        history_dict['watched_at'] = history_dict['watched_at'].isoformat()
-        
-        await db.watch_history.insert_one(history_dict)
+    # Trending counts a (user, movie) pair once, like the reseed does, so only
+    # the write that creates the row records it; heartbeats only move progress
+    if WATCH_HISTORY_WRITE_BEHIND:
+        watch_history_buffer.record(current_user['id'], history_data.movie_id, history_data.progress)
+        return {"message": "Watch history updated"}
+    
+    # Update the existing entry or create it, in a single round trip
+    history = WatchHistory(
+        user_id=current_user['id'],
+        movie_id=history_data.movie_id,
+        progress=history_data.progress
+    )
+    
+    result = await db.watch_history.update_one(
+        {"user_id": history.user_id, "movie_id": history.movie_id},
+        {
+            "$set": {
+                "watched_at": history.watched_at,
+                "progress": history.progress
+            },
+            "$setOnInsert": {"id": history.id}
+        },
+        upsert=True
+    )
+    if result.upserted_id is not None:
+        trending.record(history.movie_id, TRENDING_WATCH_WEIGHT)
     
     return {"message": "Watch history updated"}
 
+# ==================== Recommendation Routes ====================
+
+@api_router.get("/recommendations", response_model=List[Movie])
+async def get_recommendations(
+    limit: int = Query(20, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    ids = recommendations.recommend(current_user['id'], limit)
+    found = await resolve_movies(ids)
+    return json_response([found[i] for i in ids if i in found], MOVIE_LIST_ADAPTER)
+
 # ==================== Reviews Routes ====================
 
 @api_router.get("/reviews/{movie_id}", response_model=List[Review])
-async def get_reviews(movie_id: str):
-    reviews = await db.reviews.find(
-        {"movie_id": movie_id},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(1000)
-    
-    for review in reviews:
-        if isinstance(review['created_at'], str):
-            review['created_at'] = datetime.fromisoformat(review['created_at'])
+async def get_reviews(
+    movie_id: str,
+    request: Request,
+    limit: int = Query(1000, ge=1, le=1000),
+    cursor: Optional[str] = None
+):
+    cache_key = ("reviews", movie_id, limit, cursor)
+    cached = catalog_query_cache.get(cache_key)
+    if cached is None:
+        reviews, next_cursor = await fetch_page(
+            db.reviews, {"movie_id": movie_id}, 'created_at', limit, cursor,
+            projection=REVIEW_PROJECTION
+        )
+        cached = build_cached_response(reviews, REVIEW_LIST_ADAPTER, next_cursor)
+        catalog_query_cache.set(cache_key, cached)
     
-    return reviews
+    return conditional_response(request, cached, "reviews")
 
 @api_router.post("/reviews/{movie_id}")
 async def create_review(
@@ -390,23 +2666,12 @@ async def create_review(
     current_user: dict = Depends(get_current_user)
 ):
     # Check if movie exists
-    movie = await db.movies.find_one({"id": movie_id})
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
+    await ensure_movie_exists(movie_id)
     
     # Validate rating
     if review_data.rating < 1 or review_data.rating > 5:
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
     
-    # Check if user already reviewed
-    existing = await db.reviews.find_one({
-        "user_id": current_user['id'],
-        "movie_id": movie_id
-    })
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="You already reviewed this movie")
-    
     # Create review
     review = Review(
         user_id=current_user['id'],
@@ -417,18 +2682,18 @@ async def create_review(
     )
     
     review_dict = review.model_dump()
-    review_dict['created_at'] = review_dict['created_at'].isoformat()
     
-    await db.reviews.insert_one(review_dict)
+    # The unique (user_id, movie_id) index rejects a second review
+    try:
+        await db.reviews.insert_one(review_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You already reviewed this movie")
     
     # Update movie rating
-    all_reviews = await db.reviews.find({"movie_id": movie_id}).to_list(1000)
-    avg_rating = sum(r['rating'] for r in all_reviews) / len(all_reviews)
-    
-    await db.movies.update_one(
-        {"id": movie_id},
-        {"$set": {"rating_avg": round(avg_rating, 1), "rating_count": len(all_reviews)}}
-    )
+    await db.movies.update_one({"id": movie_id}, rating_increment_pipeline(review.rating))
+    invalidate_catalog(movie_id)
+    top_rated.record(movie_id, review.rating)
+    trending.record(movie_id, TRENDING_REVIEW_WEIGHT)
     
     return {"message": "Review created successfully"}
 
@@ -453,7 +2718,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/NmzuHjWmXOc",
             "rating_avg": 4.8,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -466,7 +2731,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/EXeTwQWrcwY",
             "rating_avg": 4.7,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -479,7 +2744,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/YoHD9XEInc0",
             "rating_avg": 4.6,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -492,7 +2757,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/s7EdQ4FqbhY",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -505,7 +2770,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/zSWdZVtXT7E",
             "rating_avg": 4.6,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -518,7 +2783,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/vKQi3bBA1y8",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -531,7 +2796,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/bLvqoHBptjg",
             "rating_avg": 4.4,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -544,7 +2809,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/sY1S34973zA",
             "rating_avg": 4.9,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -557,7 +2822,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/qtRKdVHc-cE",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -570,7 +2835,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/owK1qxDselE",
             "rating_avg": 4.4,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -583,7 +2848,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/TcMBFSGVi1c",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -596,7 +2861,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/lFzVJEksoDY",
             "rating_avg": 4.6,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -609,7 +2874,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/5xH0HfJHsaY",
             "rating_avg": 4.7,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -622,7 +2887,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/zAGVQLHvwOY",
             "rating_avg": 4.4,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -635,7 +2900,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/kVrqfYjkTdQ",
             "rating_avg": 4.3,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -648,7 +2913,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/v-PjgYDrg70",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -661,7 +2926,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/JfVOs4VSpmA",
             "rating_avg": 4.6,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -674,7 +2939,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/V75dMMIW2B4",
             "rating_avg": 4.8,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -687,7 +2952,7 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/lc0UehYemOA",
             "rating_avg": 4.4,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -700,23 +2965,132 @@ async def init_mock_data():
             "trailer_url": "https://www.youtube.com/embed/VyHV0BRtdxo",
             "rating_avg": 4.5,
             "rating_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
     ]
     
     await db.movies.insert_many(mock_movies)
+    movie_id_index.add(movie['id'] for movie in mock_movies)
+    content_index.add(mock_movies)
+    await adjust_genre_counts(added=[g for movie in mock_movies for g in movie['genre']])
+    invalidate_catalog()
     
     return {"message": f"Initialized {len(mock_movies)} movies"}
 
+# ==================== Admin Routes ====================
+
+@api_router.get("/admin/indexes", dependencies=[Depends(require_admin)])
+async def get_index_report():
+    return await build_index_report()
+
+@api_router.post("/admin/ratings/rebuild", dependencies=[Depends(require_admin)])
+async def rebuild_ratings(dry_run: bool = False):
+    result = await rebuild_rating_aggregates(dry_run=dry_run)
+    if not dry_run:
+        invalidate_catalog()
+    return result
+
+@api_router.get("/admin/hashing", dependencies=[Depends(require_admin)])
+async def get_hashing_stats():
+    return hashing_pool.stats()
+
+@api_router.get("/admin/watch-history-buffer", dependencies=[Depends(require_admin)])
+async def get_watch_history_buffer_stats():
+    return watch_history_buffer.stats()
+
+@api_router.get("/admin/migrations/timestamps", dependencies=[Depends(require_admin)])
+async def get_timestamp_migration_status():
+    state = await db.migrations.find_one({"_id": TIMESTAMP_MIGRATION_ID}) or {}
+    return {
+        "running": timestamp_migration_task is not None and not timestamp_migration_task.done(),
+        "completed_at": state.get("completed_at"),
+        "progress": {
+            key: {"migrated": value["migrated"], "done": value["done"]}
+            for key, value in state.get("progress", {}).items()
+        },
+    }
+
+@api_router.get("/admin/recommendations", dependencies=[Depends(require_admin)])
+async def get_recommendation_stats():
+    return {"collaborative": recommendations.stats(), "content": content_index.stats()}
+
+@api_router.post("/admin/recommendations/rebuild", dependencies=[Depends(require_admin)])
+async def rebuild_recommendations():
+    await recommendations.build()
+    return recommendations.stats()
+
+@api_router.get("/admin/slow-queries", dependencies=[Depends(require_admin)])
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$")
+):
+    return {
+        "enabled": SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": slow_query_log.threshold_ms,
+        "worst": slow_query_log.worst(limit, order_by),
+        "recent": slow_query_log.recent_entries(limit),
+    }
+
+@api_router.get("/admin/cache", dependencies=[Depends(require_admin)])
+async def get_cache_stats():
+    return {
+        "movie_ids": movie_id_index.stats(),
+        "movies": movie_cache.stats(),
+        "catalog_queries": catalog_query_cache.stats(),
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+    }
+
+@api_router.post("/admin/movies/ingest", dependencies=[Depends(require_admin)])
+async def ingest_catalog(request: Request, format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    lines = iter_lines(request.stream())
+    rows = iter_csv_rows(lines) if format == "csv" else iter_ndjson_rows(lines)
+    return await ingest_movies(rows)
+
+@api_router.get("/admin/export/{collection_name}", dependencies=[Depends(require_admin)])
+async def export_collection(
+    collection_name: str,
+    fields: Optional[str] = None,
+    after: Optional[str] = None
+):
+    if collection_name not in EXPORTABLE_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown collection")
+    return StreamingResponse(
+        stream_ndjson(db[collection_name], export_projection(collection_name, fields), after),
+        media_type="application/x-ndjson"
+    )
+
 # Include router
 app.include_router(api_router)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template, not raw path, so ids don't explode cardinality
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        HTTP_REQUESTS.labels(request.method, path, status_code).inc()
+        HTTP_REQUEST_SECONDS.labels(request.method, path).observe(time.perf_counter() - start)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 
 # Configure logging
@@ -726,6 +3100,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_db_client():
+    global leaderboard_task, timestamp_migration_task, loop_lag_task
+    loop_lag_task = asyncio.create_task(sample_event_loop_lag())
+    if SLOW_QUERY_LOG_ENABLED:
+        slow_query_log.start()
+    await ensure_indexes()
+    await movie_id_index.load()
+    # Backfill the genre table for catalogs loaded before it existed
+    if await db.genres.estimated_document_count() == 0 and await db.movies.estimated_document_count() > 0:
+        await rebuild_genre_catalog()
+    if WATCH_HISTORY_WRITE_BEHIND:
+        watch_history_buffer.start()
+    await rebuild_content_index()
+    leaderboard_task = asyncio.create_task(run_leaderboard_reseed())
+    if RECOMMENDATIONS_ENABLED:
+        recommendations.start()
+    if MIGRATE_TIMESTAMPS_ON_STARTUP:
+        timestamp_migration_task = asyncio.create_task(migrate_timestamps())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if loop_lag_task is not None:
+        loop_lag_task.cancel()
+    if timestamp_migration_task is not None:
+        timestamp_migration_task.cancel()
+    if leaderboard_task is not None:
+        leaderboard_task.cancel()
+    if content_rebuild_task is not None:
+        content_rebuild_task.cancel()
+    recommendations.stop()
+    slow_query_log.stop()
+    await watch_history_buffer.stop()
     client.close()
+    hashing_pool.shutdown()
@@ -0,0 +1,85 @@
+"""Build time and query latency of the content "more like this" index.
+
+Generates a synthetic catalog (Zipf-distributed description words, 1-3
+genres per title), builds ContentIndex and times single and batched
+similarity queries.
+
+Usage: python benchmarks/bench_content_similarity.py [--titles 100000] [--queries 200]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from server import ContentIndex  # noqa: E402
+
+GENRES = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Fantasy",
+          "Horror", "Romance", "Sci-Fi", "Thriller", "Documentary"]
+
+
+def make_catalog(titles: int, vocabulary: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    movies = []
+    for i in range(titles):
+        length = int(rng.integers(15, 40))
+        picks = np.minimum(rng.zipf(1.3, length), vocabulary) - 1
+        movies.append({
+            "id": f"movie-{i}",
+            "title": " ".join(words[j] for j in picks[:3]),
+            "description": " ".join(words[j] for j in picks),
+            "genre": list(rng.choice(GENRES, size=int(rng.integers(1, 4)), replace=False)),
+        })
+    return movies
+
+
+def percentile(samples: list, q: float) -> float:
+    return round(float(np.percentile(samples, q)) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--vocabulary', type=int, default=30_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=20, help='ids per batched query')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    movies = make_catalog(args.titles, args.vocabulary)
+    index = ContentIndex()
+    started = time.perf_counter()
+    index.build(movies)
+    build_seconds = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    ids = [movies[i]["id"] for i in rng.integers(0, args.titles, args.queries)]
+
+    single = []
+    for movie_id in ids:
+        started = time.perf_counter()
+        index.similar(movie_id, args.limit)
+        single.append(time.perf_counter() - started)
+
+    batched = []
+    for start in range(0, len(ids), args.batch):
+        started = time.perf_counter()
+        index.similar_many(ids[start:start + args.batch], args.limit)
+        batched.append((time.perf_counter() - started) / len(ids[start:start + args.batch]))
+
+    print(json.dumps({
+        "titles": args.titles,
+        "build_seconds": round(build_seconds, 2),
+        **index.stats(),
+        "single_ms": {"p50": percentile(single, 50), "p95": percentile(single, 95), "p99": percentile(single, 99)},
+        "batched_ms_per_query": {"p50": percentile(batched, 50), "p95": percentile(batched, 95)},
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
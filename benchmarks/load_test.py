@@ -0,0 +1,353 @@
+"""Concurrent load test of the API against a locally started backend.
+
+Starts uvicorn on server:app against a throwaway database on a local mongod
+(or targets an already running server with --base-url), seeds a catalog and
+a pool of users, then drives a scenario mix from N concurrent workers for a
+fixed duration. Latency percentiles and throughput are printed as JSON so
+runs can be compared across commits.
+
+Scenarios:
+  browse     catalog page, movie detail and its reviews
+  search     text search, sometimes combined with a genre filter
+  login      login storm (bcrypt bound)
+  heartbeat  watch-progress updates from signed-in users
+  review     many users reviewing the same handful of movies
+  mixed      weighted blend of all of the above
+
+Usage: python benchmarks/load_test.py [--scenario mixed] [--concurrency 50] [--duration 30]
+           [--catalog 2000] [--users 200] [--output results.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+import numpy as np
+from pymongo import MongoClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+SCENARIO_MIXES = {
+    "browse": {"browse": 1},
+    "search": {"search": 1},
+    "login": {"login": 1},
+    "heartbeat": {"heartbeat": 1},
+    "review": {"review": 1},
+    "mixed": {"browse": 50, "search": 20, "heartbeat": 20, "review": 5, "login": 5},
+}
+
+GENRES = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Fantasy",
+          "Horror", "Romance", "Sci-Fi", "Thriller", "Documentary"]
+WORDS = ["night", "star", "river", "shadow", "city", "last", "dream", "storm", "silent", "iron",
+         "garden", "echo", "winter", "fire", "glass", "ocean", "ghost", "road", "summer", "empire"]
+
+HOT_MOVIES = 10
+
+
+class Recorder:
+    """Latency samples and status counts per named request."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str,
+                      expected=(200,), **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.samples[name].append(time.perf_counter() - start)
+            self.statuses[name][type(exc).__name__] += 1
+            self.errors[name] += 1
+            return None
+        self.samples[name].append(time.perf_counter() - start)
+        self.statuses[name][str(response.status_code)] += 1
+        if response.status_code not in expected:
+            self.errors[name] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        all_samples = list(itertools.chain.from_iterable(self.samples.values()))
+        return {
+            "requests": len(all_samples),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(all_samples) / elapsed, 1),
+            "latency_ms": latency_summary(all_samples),
+            "endpoints": {
+                name: {
+                    "requests": len(samples),
+                    "errors": self.errors[name],
+                    "rps": round(len(samples) / elapsed, 1),
+                    "statuses": dict(self.statuses[name]),
+                    "latency_ms": latency_summary(samples),
+                }
+                for name, samples in sorted(self.samples.items())
+            },
+        }
+
+
+def latency_summary(samples: list) -> dict:
+    if not samples:
+        return {}
+    values = np.array(samples) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2),
+        "p99": round(float(np.percentile(values, 99)), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+class LoadState:
+    """Catalog ids, search terms and signed-in users shared by all workers."""
+
+    def __init__(self, movie_ids: list, terms: list, users: list, seed: int):
+        self.movie_ids = movie_ids
+        self.terms = terms
+        self.users = users
+        self.rng = random.Random(seed)
+        hot = self.rng.sample(movie_ids, min(HOT_MOVIES, len(movie_ids)))
+        # Once every user has reviewed every hot movie, repeats are expected 400s
+        self.review_pairs = itertools.cycle(itertools.product(hot, range(len(users))))
+
+    def auth(self, user: dict) -> dict:
+        return {"Authorization": f"Bearer {user['token']}"}
+
+
+async def browse(client, state: LoadState, rec: Recorder):
+    await rec.request(client, "GET /movies", "GET", "/api/movies", params={"limit": 20})
+    movie_id = state.rng.choice(state.movie_ids)
+    await rec.request(client, "GET /movies/{id}", "GET", f"/api/movies/{movie_id}")
+    await rec.request(client, "GET /reviews/{id}", "GET", f"/api/reviews/{movie_id}")
+
+
+async def search(client, state: LoadState, rec: Recorder):
+    params = {"search": state.rng.choice(state.terms), "limit": 20}
+    if state.rng.random() < 0.3:
+        params["genre"] = state.rng.choice(GENRES)
+    await rec.request(client, "GET /movies?search", "GET", "/api/movies", params=params)
+
+
+async def login(client, state: LoadState, rec: Recorder):
+    user = state.rng.choice(state.users)
+    await rec.request(client, "POST /auth/login", "POST", "/api/auth/login",
+                      json={"email": user["email"], "password": user["password"]})
+
+
+async def heartbeat(client, state: LoadState, rec: Recorder):
+    user = state.rng.choice(state.users)
+    body = {"movie_id": state.rng.choice(state.movie_ids), "progress": state.rng.randint(0, 100)}
+    await rec.request(client, "POST /watch-history", "POST", "/api/watch-history",
+                      json=body, headers=state.auth(user))
+
+
+async def review(client, state: LoadState, rec: Recorder):
+    movie_id, user_index = next(state.review_pairs)
+    body = {"rating": state.rng.randint(1, 5), "comment": "load test review"}
+    await rec.request(client, "POST /reviews/{id}", "POST", f"/api/reviews/{movie_id}",
+                      expected=(200, 400), json=body, headers=state.auth(state.users[user_index]))
+
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "login": login,
+    "heartbeat": heartbeat,
+    "review": review,
+}
+
+
+async def worker(client, state: LoadState, rec: Recorder, mix: dict, deadline: float):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        scenario = state.rng.choices(names, weights)[0]
+        await SCENARIOS[scenario](client, state, rec)
+
+
+async def run_phase(client, state: LoadState, mix: dict, concurrency: int, duration: float) -> dict:
+    rec = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(client, state, rec, mix, start + duration) for _ in range(concurrency)
+    ))
+    return rec.report(time.perf_counter() - start)
+
+
+# ==================== Setup ====================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ, **env}
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"server exited with code {server.returncode}")
+        try:
+            if (await client.get("/api/genres")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise SystemExit("server did not become ready")
+
+
+def synthetic_catalog(size: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        lines.append(json.dumps({
+            "id": f"load-{seed}-{i}",
+            "title": " ".join(rng.sample(WORDS, rng.randint(1, 3))).title(),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(15, 40))),
+            "genre": rng.sample(GENRES, rng.randint(1, 3)),
+            "year": rng.randint(1970, 2025),
+            "duration": rng.randint(80, 180),
+            "poster_url": f"https://example.com/posters/{i}.jpg",
+            "trailer_url": f"https://example.com/trailers/{i}",
+        }))
+    return "\n".join(lines).encode()
+
+
+async def seed(client: httpx.AsyncClient, args, admin_token: str) -> LoadState:
+    await client.post("/api/init-data")
+    if args.catalog and admin_token:
+        response = await client.post(
+            "/api/admin/movies/ingest", params={"format": "ndjson"},
+            content=synthetic_catalog(args.catalog, args.seed),
+            headers={"X-Admin-Token": admin_token}, timeout=600
+        )
+        response.raise_for_status()
+
+    movies, cursor = [], None
+    while len(movies) < args.max_ids:
+        params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/movies", params=params)
+        response.raise_for_status()
+        movies.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    if not movies:
+        raise SystemExit("catalog is empty")
+    terms = sorted({word.lower() for movie in movies for word in movie["title"].split() if len(word) > 3})
+
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def register(i: int) -> dict:
+        user = {"email": f"load-{run_id}-{i}@example.com", "password": secrets.token_urlsafe(12)}
+        async with semaphore:
+            response = await client.post("/api/auth/register", json={**user, "name": f"Load {i}"}, timeout=120)
+        response.raise_for_status()
+        user["token"] = response.json()["access_token"]
+        return user
+
+    users = await asyncio.gather(*(register(i) for i in range(args.users)))
+    return LoadState([movie["id"] for movie in movies], terms, list(users), args.seed)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    server = None
+    admin_token = args.admin_token
+    base_url = args.base_url
+    if base_url is None:
+        port = free_port()
+        admin_token = admin_token or secrets.token_urlsafe(16)
+        server = start_server(port, args.workers, {
+            "MONGO_URL": args.mongo_url,
+            "DB_NAME": args.db_name,
+            "ADMIN_TOKEN": admin_token,
+        })
+        base_url = f"http://127.0.0.1:{port}"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            await wait_ready(client, server, args.startup_timeout)
+            state = await seed(client, args, admin_token)
+            mix = SCENARIO_MIXES[args.scenario]
+            if args.warmup > 0:
+                await run_phase(client, state, mix, args.concurrency, args.warmup)
+            report = await run_phase(client, state, mix, args.concurrency, args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+            if not args.keep_db:
+                MongoClient(args.mongo_url).drop_database(args.db_name)
+
+    return {
+        "commit": git_commit(),
+        "scenario": args.scenario,
+        "mix": SCENARIO_MIXES[args.scenario],
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "server_workers": args.workers if server is not None else None,
+        "movies": len(state.movie_ids),
+        "users": len(state.users),
+        **report,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=sorted(SCENARIO_MIXES), default='mixed')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=30, help='seconds of measured load')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds of unmeasured load first')
+    parser.add_argument('--catalog', type=int, default=2000, help='synthetic movies to ingest')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--max-ids', type=int, default=5000, help='movie ids to sample requests from')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn workers for the local server')
+    parser.add_argument('--base-url', help='target a running server instead of starting one')
+    parser.add_argument('--admin-token', help='needed with --base-url to ingest the synthetic catalog')
+    parser.add_argument('--mongo-url', default=os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    parser.add_argument('--db-name', default=f"loadtest_{uuid.uuid4().hex[:8]}")
+    parser.add_argument('--keep-db', action='store_true', help='do not drop the database afterwards')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help='also write the JSON result to this file')
+    args = parser.parse_args()
+
+    result = json.dumps(asyncio.run(run(args)), indent=2)
+    print(result)
+    if args.output:
+        args.output.write_text(result + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Micro-benchmarks for the CPU-bound helpers in backend/server.py.
+
+Record a baseline, then compare later runs against it; the compare run
+fails when any benchmark's median regresses by more than the threshold:
+
+    pytest benchmarks/micro --benchmark-save=baseline
+    pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=median:15%
+
+Baselines are stored per machine under benchmarks/micro/baselines, so only
+compare runs from the same host. --catalog-size and --page-size control the
+synthetic catalog.
+"""
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent.parent / 'backend'))
+
+GENRES = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Fantasy",
+          "Horror", "Romance", "Sci-Fi", "Thriller", "Documentary"]
+
+
+def pytest_addoption(parser):
+    parser.addoption('--catalog-size', type=int, default=1000, help='movies in the synthetic catalog')
+    parser.addoption('--page-size', type=int, default=100, help='movies per serialized page')
+
+
+def pytest_configure(config):
+    # Keep baselines next to the suite rather than in the current directory
+    if config.getoption('benchmark_storage', None) == 'file://./.benchmarks':
+        config.option.benchmark_storage = (HERE / 'baselines').as_uri()
+
+
+def make_catalog(size: int, seed: int = 0) -> list:
+    """Movie documents as read from MongoDB with MOVIE_PROJECTION."""
+    rng = np.random.default_rng(seed)
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": str(uuid.UUID(int=int(rng.integers(0, 2**63)))),
+            "title": f"Movie {i}",
+            "description": "A synthetic description long enough to look like a real synopsis. " * 3,
+            "genre": [str(g) for g in rng.choice(GENRES, size=int(rng.integers(1, 4)), replace=False)],
+            "year": int(rng.integers(1970, 2026)),
+            "duration": int(rng.integers(80, 180)),
+            "poster_url": f"https://example.com/posters/{i}.jpg",
+            "trailer_url": f"https://www.youtube.com/watch?v={i}",
+            "rating_avg": round(float(rng.uniform(1, 5)), 1),
+            "rating_count": int(rng.integers(0, 5000)),
+            "created_at": created + timedelta(minutes=i),
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.fixture(scope='session')
+def catalog(request) -> list:
+    return make_catalog(request.config.getoption('--catalog-size'))
+
+
+@pytest.fixture(scope='session')
+def page(request, catalog) -> list:
+    return catalog[:request.config.getoption('--page-size')]
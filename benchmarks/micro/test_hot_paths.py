@@ -0,0 +1,62 @@
+import jwt
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import server  # noqa: E402
+from server import (  # noqa: E402
+    ALGORITHM, MOVIE_LIST_ADAPTER, SECRET_KEY, Movie, Review, User,
+    create_access_token, hash_password, render_json, token_claims, verify_password,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture(scope='module')
+def user() -> User:
+    return User(email="bench@example.com", name="Bench")
+
+
+# ==================== Auth ====================
+
+def test_hash_password(benchmark):
+    benchmark(hash_password, PASSWORD)
+
+
+def test_verify_password(benchmark):
+    hashed = hash_password(PASSWORD)
+    assert benchmark(verify_password, PASSWORD, hashed)
+
+
+def test_create_access_token(benchmark, user):
+    benchmark(create_access_token, token_claims(user))
+
+
+def test_decode_access_token(benchmark, user):
+    token = create_access_token(token_claims(user))
+    payload = benchmark(jwt.decode, token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == user.id
+
+
+# ==================== Models ====================
+
+def test_movie_construction(benchmark, catalog):
+    movies = benchmark(lambda: [Movie(**doc) for doc in catalog])
+    assert len(movies) == len(catalog)
+
+
+def test_review_construction(benchmark, user):
+    benchmark(Review, user_id=user.id, user_name=user.name, movie_id="movie-1",
+              rating=4, comment="Great pacing, weak ending.")
+
+
+# ==================== Serialization ====================
+
+def test_serialize_page_fast(benchmark, monkeypatch, page):
+    monkeypatch.setattr(server, 'FAST_JSON_RESPONSES', True)
+    benchmark(render_json, page, MOVIE_LIST_ADAPTER)
+
+
+def test_serialize_page_validated(benchmark, monkeypatch, page):
+    monkeypatch.setattr(server, 'FAST_JSON_RESPONSES', False)
+    benchmark(render_json, page, MOVIE_LIST_ADAPTER)
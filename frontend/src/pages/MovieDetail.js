@@ -52,9 +52,8 @@ function MovieDetail({ user, onOpenAuth }) {
 
   const checkFavorite = async () => {
     try {
-      const response = await authApi.get("/favorites");
-      const favoriteIds = response.data.map(m => m.id);
-      setIsFavorite(favoriteIds.includes(id));
+      const response = await authApi.get(`/favorites/${id}`);
+      setIsFavorite(response.data.is_favorite);
     } catch (error) {
       console.error("Error checking favorite:", error);
     }
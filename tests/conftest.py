@@ -0,0 +1,17 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+
+def collect(iterator) -> list:
+    """Drain an async iterator synchronously."""
+    async def drain():
+        return [item async for item in iterator]
+    return asyncio.run(drain())
+
+
+async def aiter_of(items):
+    for item in items:
+        yield item
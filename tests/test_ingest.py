@@ -0,0 +1,62 @@
+from server import iter_csv_rows, iter_lines, iter_ndjson_rows
+
+from .conftest import aiter_of, collect
+
+
+def errors(rows: list) -> list:
+    return [str(row) for row in rows if isinstance(row, Exception)]
+
+
+def test_iter_lines_joins_chunks_and_strips_crlf():
+    chunks = [b'{"id": "a"}\r\n{"i', b'd": "b"}\n', b'last']
+    assert collect(iter_lines(aiter_of(chunks))) == ['{"id": "a"}', '{"id": "b"}', 'last']
+
+
+def test_iter_lines_reports_invalid_utf8_per_line():
+    lines = collect(iter_lines(aiter_of([b'ok\n\xff\xfe\nfine\n'])))
+    assert lines[0] == 'ok' and lines[2] == 'fine'
+    assert isinstance(lines[1], ValueError) and "Invalid UTF-8" in str(lines[1])
+
+
+def test_ndjson_rows_skip_blank_lines_and_report_bad_json():
+    rows = collect(iter_ndjson_rows(aiter_of(['{"id": "a"}', '', '{broken', '[1]'])))
+    assert rows[0] == {"id": "a"}
+    assert rows[2] == [1]
+    assert len(errors(rows)) == 1 and errors(rows)[0].startswith("Invalid JSON")
+
+
+def test_ndjson_rows_pass_decode_errors_through():
+    rows = collect(iter_ndjson_rows(iter_lines(aiter_of([b'\xff\n{"id": "a"}\n']))))
+    assert errors(rows)[0].startswith("Invalid UTF-8")
+    assert rows[1] == {"id": "a"}
+
+
+def test_csv_rows_parse_header_genres_and_quoted_newlines():
+    lines = [
+        '﻿id,title,description,genre',
+        'a,Heat,"A heist,',
+        'then a chase",Crime|Thriller',
+        'b,Up,,Animation',
+    ]
+    rows = collect(iter_csv_rows(aiter_of(lines)))
+    assert rows == [
+        {"id": "a", "title": "Heat", "description": "A heist,\nthen a chase", "genre": ["Crime", "Thriller"]},
+        {"id": "b", "title": "Up", "genre": ["Animation"]},
+    ]
+
+
+def test_csv_rows_report_column_count_mismatch():
+    rows = collect(iter_csv_rows(aiter_of(['id,title', 'a,Heat,extra', 'b,Up'])))
+    assert errors(rows) == ["Expected 2 columns, got 3"]
+    assert rows[1] == {"id": "b", "title": "Up"}
+
+
+def test_csv_rows_report_unterminated_quote():
+    rows = collect(iter_csv_rows(aiter_of(['id,title', 'a,"Heat'])))
+    assert errors(rows) == ["Unterminated quoted field at end of input"]
+
+
+def test_csv_rows_report_invalid_utf8_and_continue():
+    rows = collect(iter_csv_rows(iter_lines(aiter_of([b'id,title\na,He\xffat\nb,Up\n']))))
+    assert len(errors(rows)) == 1 and errors(rows)[0].startswith("Invalid UTF-8")
+    assert rows[1] == {"id": "b", "title": "Up"}
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from server import TopN
+
+
+def brute_force(scores: dict, size: int) -> list:
+    return [movie_id for score, movie_id in sorted(((s, m) for m, s in scores.items()), reverse=True)[:size]]
+
+
+def apply(top: TopN, scores: dict, movie_id: str, score: float) -> None:
+    scores[movie_id] = score
+    if not top.update(movie_id, score):
+        top.replace(scores)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+@pytest.mark.parametrize("seed", range(20))
+def test_topn_matches_sorted_scores(size, seed):
+    rng = random.Random(seed)
+    movies = [f"m{i}" for i in range(8)]
+    scores = {}
+    top = TopN(size)
+    for _ in range(200):
+        # Small integer scores so ties and decreases are common
+        apply(top, scores, rng.choice(movies), float(rng.randint(0, 10)))
+        assert top.ids == brute_force(scores, size)
+
+
+def test_topn_size_one_lowering_the_only_entry():
+    scores = {"a": 5.0, "b": 3.0}
+    top = TopN(1)
+    top.replace(scores)
+    assert top.ids == ["a"]
+    apply(top, scores, "a", 1.0)
+    assert top.ids == ["b"]
+
+
+def test_topn_size_one_raising_the_only_entry():
+    scores = {"a": 5.0, "b": 3.0}
+    top = TopN(1)
+    top.replace(scores)
+    assert top.update("a", 9.0)
+    assert top.ids == ["a"]
+
+
+def test_topn_ignores_scores_below_a_full_board():
+    top = TopN(2)
+    top.replace({"a": 5.0, "b": 4.0})
+    assert top.update("c", 1.0)
+    assert top.ids == ["a", "b"]
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from server import decode_cursor, encode_cursor, keyset_query, trim_page
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip('=')
+
+
+def test_cursor_round_trip():
+    at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor([at, "m1"])) == [at, "m1"]
+    assert decode_cursor(encode_cursor(["Title", "m2"])) == ["Title", "m2"]
+
+
+def test_cursor_is_url_safe_without_padding():
+    token = encode_cursor(["??>>", "x" * 7])
+    assert "=" not in token and "+" not in token and "/" not in token
+
+
+@pytest.mark.parametrize("token", ["not base64!", raw_cursor({"a": 1}), "e30", ""])
+def test_decode_cursor_rejects_garbage(token):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(token)
+    assert e.value.status_code == 400
+
+
+def test_keyset_query_without_cursor_leaves_query():
+    assert keyset_query({"genre": "Drama"}, "created_at", None) == {"genre": "Drama"}
+
+
+def test_keyset_query_continues_after_cursor():
+    query = keyset_query({}, "title", encode_cursor(["Heat", "m9"]))
+    assert query == {"$or": [
+        {"title": {"$lt": "Heat"}},
+        {"title": "Heat", "id": {"$lt": "m9"}},
+    ]}
+
+
+def test_keyset_query_date_cursor_includes_unmigrated_rows():
+    at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    query = keyset_query({}, "created_at", encode_cursor([at, "m1"]))
+    assert {"created_at": {"$type": "string"}} in query["$or"]
+
+
+@pytest.mark.parametrize("values", [
+    [{"$gt": ""}, "m1"],
+    ["Heat", {"$ne": None}],
+    ["Heat", "m1", "extra"],
+    ["Heat"],
+    [1, "m1"],
+    [None, "m1"],
+])
+def test_keyset_query_rejects_operator_injection(values):
+    with pytest.raises(HTTPException) as e:
+        keyset_query({}, "title", raw_cursor(values))
+    assert e.value.status_code == 400
+
+
+def test_trim_page_builds_cursor_from_last_kept_row():
+    docs = [{"id": f"m{i}", "title": f"t{i}"} for i in range(4)]
+    page, cursor = trim_page(docs, "title", 3)
+    assert [d["id"] for d in page] == ["m0", "m1", "m2"]
+    assert decode_cursor(cursor) == ["t2", "m2"]
+    assert trim_page(docs, "title", 4) == (docs, None)
@@ -0,0 +1,37 @@
+from server import query_shape, summarize_plan
+
+
+def test_query_shape_replaces_literals():
+    assert query_shape({"id": "m1", "year": {"$gte": 1990}}) == {"id": "?", "year": {"$gte": "?"}}
+
+
+def test_query_shape_collapses_uniform_lists():
+    assert query_shape({"id": {"$in": ["a", "b", "c"]}}) == query_shape({"id": {"$in": ["z"]}})
+
+
+def test_query_shape_keeps_mixed_lists_and_logical_operators():
+    assert query_shape([1, {"a": 1}]) == ["?", {"a": "?"}]
+    assert query_shape({"$or": [{"a": 1}, {"a": 2}]}) == {"$or": [{"a": "?"}, {"a": "?"}]}
+
+
+def test_query_shape_keeps_sort_and_pipeline_order():
+    pipeline = [{"$match": {"genre": "Drama"}}, {"$sort": {"year": -1}}, {"$limit": 10}]
+    assert query_shape(pipeline, "pipeline") == [
+        {"$match": {"genre": "?"}},
+        {"$sort": {"year": -1}},
+        {"$limit": "?"},
+    ]
+    assert query_shape({"created_at": -1, "id": -1}, "sort") == {"created_at": -1, "id": -1}
+
+
+def test_summarize_plan_flags_collscan_and_in_memory_sort():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "SORT",
+        "inputStage": {"stage": "COLLSCAN"},
+    }, "rejectedPlans": [{"stage": "IXSCAN", "indexName": "genre_1"}]}}
+    assert summarize_plan(explain) == {
+        "stages": ["SORT", "COLLSCAN"],
+        "indexes": [],
+        "collscan": True,
+        "in_memory_sort": True,
+    }